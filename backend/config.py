@@ -3,6 +3,8 @@ config.py - API keys, database settings, and constants
 """
 
 import os
+import re
+from types import MappingProxyType
 from dotenv import load_dotenv
 from typing import Dict, List
 
@@ -125,6 +127,10 @@ class Settings:
         "scrum": "Scrum",
     }
     
+    # Lowercased synonym keys, precomputed once at load time so consumers
+    # don't rebuild the mapping per instance
+    SKILL_SYNONYMS_LC: Dict[str, str] = {k.lower(): v for k, v in SKILL_SYNONYMS.items()}
+
     # Common degree patterns
     DEGREE_PATTERNS: Dict[str, List[str]] = {
         "phd": ["phd", "ph.d", "doctorate", "doctor of philosophy"],
@@ -135,5 +141,32 @@ class Settings:
     }
 
 
+# Freeze the shared lookup tables: consumers read them on hot paths and
+# nothing should mutate them after load
+Settings.SKILL_SYNONYMS = MappingProxyType(Settings.SKILL_SYNONYMS)
+Settings.SKILL_SYNONYMS_LC = MappingProxyType(Settings.SKILL_SYNONYMS_LC)
+Settings.DEGREE_PATTERNS = MappingProxyType(
+    {degree: tuple(patterns) for degree, patterns in Settings.DEGREE_PATTERNS.items()}
+)
+
+# Degree tokens compiled into a single alternation so degree extraction is
+# one pass over the text regardless of pattern count. DEGREE_PATTERN_LOOKUP
+# maps each matched token back to its degree level.
+DEGREE_PATTERN_RE = re.compile(
+    r'(?<!\w)(?:' + '|'.join(
+        re.escape(pattern)
+        for pattern in sorted(
+            (p for patterns in Settings.DEGREE_PATTERNS.values() for p in patterns),
+            key=len,
+            reverse=True
+        )
+    ) + r')(?!\w)'
+)
+DEGREE_PATTERN_LOOKUP = {
+    pattern: degree
+    for degree, patterns in Settings.DEGREE_PATTERNS.items()
+    for pattern in patterns
+}
+
 # Global settings instance
 settings = Settings()
\ No newline at end of file
@@ -3,6 +3,9 @@ evaluation.py - Candidate scoring logic
 """
 
 import re
+import asyncio
+from bisect import bisect_right
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
@@ -17,73 +20,104 @@ from rag_utils import RAGProcessor
 class RoleLevelInferrer:
     """Infers role level from job description."""
     
-    LEVEL_INDICATORS = {
-        RoleLevel.INTERN: {
-            "keywords": ["intern", "internship", "trainee", "student", "entry-level"],
-            "experience_years": (0, 1),
-            "weight": 1
-        },
-        RoleLevel.JUNIOR: {
-            "keywords": ["junior", "associate", "graduate", "entry level", "0-2 years", "1-2 years", "fresher"],
-            "experience_years": (0, 2),
-            "weight": 2
-        },
-        RoleLevel.MID: {
-            "keywords": ["mid-level", "mid level", "intermediate", "3-5 years", "2-4 years", "3+ years"],
-            "experience_years": (2, 5),
-            "weight": 3
-        },
-        RoleLevel.SENIOR: {
-            "keywords": ["senior", "sr.", "experienced", "5+ years", "5-8 years", "7+ years", "expert"],
-            "experience_years": (5, 10),
-            "weight": 4
-        },
-        RoleLevel.LEAD: {
-            "keywords": ["lead", "principal", "staff", "architect", "manager", "head", "director", "10+ years"],
-            "experience_years": (8, 20),
-            "weight": 5
+    # Level metadata in structure-of-arrays layout: parallel tuples indexed
+    # by level ordinal. Scoring iterates by index instead of paying several
+    # dict lookups per level as the old dict-of-dicts layout did.
+    _LEVELS = (RoleLevel.INTERN, RoleLevel.JUNIOR, RoleLevel.MID, RoleLevel.SENIOR, RoleLevel.LEAD)
+    _KEYWORDS = (
+        ("intern", "internship", "trainee", "student", "entry-level"),
+        ("junior", "associate", "graduate", "entry level", "0-2 years", "1-2 years", "fresher"),
+        ("mid-level", "mid level", "intermediate", "3-5 years", "2-4 years", "3+ years"),
+        ("senior", "sr.", "experienced", "5+ years", "5-8 years", "7+ years", "expert"),
+        ("lead", "principal", "staff", "architect", "manager", "head", "director", "10+ years"),
+    )
+    # Experience bands, parallel to _LEVELS. Bands overlap by design, so
+    # every band is checked against the JD's minimum.
+    _EXP_BANDS = ((0, 1), (0, 2), (2, 5), (5, 10), (8, 20))
+
+    # Single alternation pattern over every level keyword, compiled lazily on
+    # first use. One scan of the JD text replaces ~30 independent substring
+    # searches. _KW_IMPLIES maps each keyword to the keywords contained in it
+    # (e.g. "internship" implies "intern") so presence scoring is unchanged.
+    _KW_PATTERN: Optional[re.Pattern] = None
+    _KW_IMPLIES: Dict[str, List[str]] = {}
+
+    @classmethod
+    def _build_keyword_scanner(cls) -> None:
+        all_keywords = [kw for keywords in cls._KEYWORDS for kw in keywords]
+        cls._KW_PATTERN = re.compile(
+            '|'.join(re.escape(kw) for kw in sorted(all_keywords, key=len, reverse=True))
+        )
+        cls._KW_IMPLIES = {
+            kw: [other for other in all_keywords if other in kw]
+            for kw in all_keywords
         }
-    }
-    
+
     def infer_role_level(self, jd: JobDescriptionInput) -> RoleLevel:
         """Infer role level from job description."""
-        jd_text = f"{jd.title} {jd.description}".lower()
-        
-        level_scores = {}
-        
-        for level, indicators in self.LEVEL_INDICATORS.items():
+        # Pydantic models aren't hashable, so cache on the fields that
+        # actually drive the inference
+        return self._infer_cached(jd.title, jd.description, jd.min_experience_years)
+
+    @lru_cache(maxsize=256)
+    def _infer_cached(
+        self,
+        title: str,
+        description: str,
+        min_experience_years: Optional[int]
+    ) -> RoleLevel:
+        """Memoized inference; the same JD is re-scanned across evaluations."""
+        if RoleLevelInferrer._KW_PATTERN is None:
+            self._build_keyword_scanner()
+
+        jd_text = f"{title} {description}".lower()
+
+        # One pass over the JD text to find which keywords are present;
+        # dedupe repeated matches before the containment expansion
+        present_keywords = set()
+        for keyword in set(self._KW_PATTERN.findall(jd_text)):
+            present_keywords.update(self._KW_IMPLIES[keyword])
+
+        level_scores = [0] * len(self._LEVELS)
+
+        # Check keywords
+        for i, keywords in enumerate(self._KEYWORDS):
             score = 0
-            
-            # Check keywords
-            for keyword in indicators["keywords"]:
-                if keyword in jd_text:
+            for keyword in keywords:
+                if keyword in present_keywords:
                     score += 2
-            
-            # Check experience years
-            if jd.min_experience_years is not None:
-                min_exp, max_exp = indicators["experience_years"]
-                if min_exp <= jd.min_experience_years <= max_exp:
-                    score += 3
-            
-            level_scores[level] = score
-        
-        # Return level with highest score, default to Mid if no clear match
-        if max(level_scores.values()) == 0:
-            return RoleLevel.MID
-        
-        return max(level_scores, key=level_scores.get)
+            level_scores[i] = score
+
+        # Check experience years against the precomputed bands
+        if min_experience_years is not None:
+            min_years = min_experience_years
+            for i, (min_exp, max_exp) in enumerate(self._EXP_BANDS):
+                if min_exp <= min_years <= max_exp:
+                    level_scores[i] += 3
+
+        # Return level with highest score, default to Mid if no clear match;
+        # one pass replaces the max() + index() double traversal
+        best_level, best_score = RoleLevel.MID, 0
+        for i, score in enumerate(level_scores):
+            if score > best_score:
+                best_score, best_level = score, self._LEVELS[i]
+        return best_level
 
 
 class SkillNormalizer:
     """Normalizes skill names for consistent matching."""
-    
+
+    # Lowercased synonyms, precomputed once in config at load time
+    _SYN = settings.SKILL_SYNONYMS_LC
+
     def __init__(self):
-        self.synonyms = {k.lower(): v for k, v in settings.SKILL_SYNONYMS.items()}
-    
-    def normalize(self, skill: str) -> str:
-        """Normalize a skill name."""
-        skill_lower = skill.lower().strip()
-        return self.synonyms.get(skill_lower, skill.strip())
+        self.synonyms = self._SYN
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def normalize(skill: str) -> str:
+        """Normalize a skill name (memoized; skills repeat across candidates)."""
+        return SkillNormalizer._SYN.get(skill.lower().strip(), skill.strip())
     
     def normalize_list(self, skills: List[str]) -> List[str]:
         """Normalize a list of skills and remove duplicates."""
@@ -92,108 +126,148 @@ class SkillNormalizer:
             normalized.add(self.normalize(skill))
         return list(normalized)
     
+    @lru_cache(maxsize=32)
+    def _compile_skill_regex(self, reference_skills: Tuple[str, ...]) -> Tuple[re.Pattern, Dict[str, str]]:
+        """
+        Build one combined alternation regex for a reference skill list.
+
+        Returns the compiled pattern plus a mapping from each lowercase
+        variant (normalized and original form) back to the normalized skill,
+        so a single scan of the text recovers all matches.
+        """
+        variant_to_normalized = {}
+        for skill in reference_skills:
+            normalized = self.normalize(skill)
+            variant_to_normalized[normalized.lower()] = normalized
+            variant_to_normalized[skill.lower().strip()] = normalized
+
+        pattern = re.compile(
+            r'\b(?:' + '|'.join(
+                re.escape(v) for v in sorted(variant_to_normalized, key=len, reverse=True)
+            ) + r')\b'
+        )
+        return pattern, variant_to_normalized
+
     def extract_skills_from_text(self, text: str, reference_skills: List[str]) -> List[str]:
         """Extract skills from text that match reference skills."""
-        text_lower = text.lower()
+        if not reference_skills:
+            return []
+
+        pattern, variant_to_normalized = self._compile_skill_regex(tuple(reference_skills))
+
         found_skills = set()
-        
-        for skill in reference_skills:
-            skill_normalized = self.normalize(skill)
-            skill_lower = skill_normalized.lower()
-            
-            # Check for exact match or word boundary match
-            pattern = r'\b' + re.escape(skill_lower) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.add(skill_normalized)
-            
-            # Also check for the original skill
-            if skill.lower() in text_lower:
-                found_skills.add(skill_normalized)
-        
+        for match in pattern.finditer(text.lower()):
+            found_skills.add(variant_to_normalized[match.group()])
+
         return list(found_skills)
 
 
+def _skills_score_kernel(
+    mandatory_matched: int,
+    total_mandatory: int,
+    optional_matched: int,
+    total_optional: int
+) -> float:
+    """
+    Pure-arithmetic skills score.
+
+    Mandatory skills are worth 70% and optional skills 30%, with a 10-point
+    penalty per missing mandatory skill. Kept as a module-level function of
+    plain ints so batch scoring pays no attribute or dict lookups.
+    """
+    if total_mandatory > 0:
+        mandatory_score = (mandatory_matched / total_mandatory) * 70
+    else:
+        mandatory_score = 70  # Full marks if no mandatory skills
+
+    if total_optional > 0:
+        optional_score = (optional_matched / total_optional) * 30
+    else:
+        optional_score = 30  # Full marks if no optional skills
+
+    penalty = (total_mandatory - mandatory_matched) * 10
+    return min(100, max(0, (mandatory_score + optional_score) - penalty))
+
+
 class ScoreCalculator:
     """Calculates scores for candidates."""
     
     def __init__(self):
         self.weights = settings.SCORING_WEIGHTS
         self.thresholds = settings.RECOMMENDATION_THRESHOLDS
+        # Weights bound as plain floats so the per-candidate final-score
+        # arithmetic avoids dict lookups
+        self._w_skills = self.weights["skills"]
+        self._w_experience = self.weights["experience"]
+        self._w_education = self.weights["education"]
+        # Thresholds sorted ascending with their recommendations, so
+        # determine_recommendation is a single bisect
+        self._threshold_values = [
+            self.thresholds["weak_fit"],
+            self.thresholds["partial_fit"],
+            self.thresholds["strong_fit"],
+        ]
+        self._recommendations = [
+            Recommendation.WEAK_FIT,
+            Recommendation.PARTIAL_FIT,
+            Recommendation.STRONG_FIT,
+        ]
     
     def calculate_skills_score(
         self,
-        matched_skills: List[str],
-        missing_skills: List[str],
-        mandatory_skills: List[str],
-        optional_skills: List[str]
+        matched_set: frozenset,
+        mandatory_set: frozenset,
+        optional_set: frozenset
     ) -> float:
-        """Calculate skills match score."""
-        if not mandatory_skills and not optional_skills:
+        """
+        Calculate skills match score.
+
+        All three arguments are lowercased, normalized skill sets built by
+        the caller (the JD sets once per evaluation, the matched set once
+        per candidate), so the scoring itself is two intersections.
+        """
+        if not mandatory_set and not optional_set:
             return 50.0  # Default if no skills specified
-        
-        total_mandatory = len(mandatory_skills)
-        total_optional = len(optional_skills)
-        
-        # Normalize all skills for comparison
-        normalizer = SkillNormalizer()
-        matched_normalized = set(normalizer.normalize(s) for s in matched_skills)
-        mandatory_normalized = set(normalizer.normalize(s) for s in mandatory_skills)
-        optional_normalized = set(normalizer.normalize(s) for s in optional_skills)
-        
+
+        total_mandatory = len(mandatory_set)
+        total_optional = len(optional_set)
+
         # Count matches
-        mandatory_matched = len(matched_normalized.intersection(mandatory_normalized))
-        optional_matched = len(matched_normalized.intersection(optional_normalized))
-        
-        # Mandatory skills are worth 70% of skills score
-        mandatory_score = 0
-        if total_mandatory > 0:
-            mandatory_score = (mandatory_matched / total_mandatory) * 70
-        else:
-            mandatory_score = 70  # Full marks if no mandatory skills
-        
-        # Optional skills are worth 30% of skills score
-        optional_score = 0
-        if total_optional > 0:
-            optional_score = (optional_matched / total_optional) * 30
-        else:
-            optional_score = 30  # Full marks if no optional skills
-        
-        # Heavy penalty for missing mandatory skills
-        missing_mandatory = total_mandatory - mandatory_matched
-        penalty = missing_mandatory * 10  # 10 points penalty per missing mandatory skill
-        
-        final_score = max(0, (mandatory_score + optional_score) - penalty)
-        return min(100, final_score)
+        mandatory_matched = len(matched_set & mandatory_set)
+        optional_matched = len(matched_set & optional_set)
+
+        return _skills_score_kernel(
+            mandatory_matched, total_mandatory, optional_matched, total_optional
+        )
     
     def calculate_final_score(self, scores: ScoreBreakdown) -> float:
         """Calculate weighted final score."""
         final = (
-            scores.skills_score * self.weights["skills"] +
-            scores.experience_score * self.weights["experience"] +
-            scores.education_score * self.weights["education"]
+            scores.skills_score * self._w_skills +
+            scores.experience_score * self._w_experience +
+            scores.education_score * self._w_education
         )
         return round(final, 2)
     
     def determine_recommendation(self, final_score: float) -> Recommendation:
         """Determine recommendation based on final score."""
-        if final_score >= self.thresholds["strong_fit"]:
-            return Recommendation.STRONG_FIT
-        elif final_score >= self.thresholds["partial_fit"]:
-            return Recommendation.PARTIAL_FIT
-        else:
-            return Recommendation.WEAK_FIT
+        index = bisect_right(self._threshold_values, final_score) - 1
+        return self._recommendations[max(0, index)]
 
 
 class CandidateEvaluator:
     """Main candidate evaluation orchestrator."""
-    
-    def __init__(self):
-        self.rag_processor = RAGProcessor()
+
+    def __init__(self, rag_processor: Optional[RAGProcessor] = None):
+        # Reuse the caller's RAGProcessor when given: the context cache is
+        # per-instance, so evaluation must run on the same instance that
+        # indexes uploads or invalidation never reaches it
+        self.rag_processor = rag_processor if rag_processor is not None else RAGProcessor()
         self.role_inferrer = RoleLevelInferrer()
         self.skill_normalizer = SkillNormalizer()
         self.score_calculator = ScoreCalculator()
     
-    def evaluate_candidates(
+    async def evaluate_candidates(
         self,
         jd: JobDescriptionInput,
         candidate_ids: Optional[List[str]] = None
@@ -206,7 +280,10 @@ class CandidateEvaluator:
         # Normalize skills
         mandatory_skills = self.skill_normalizer.normalize_list(jd.mandatory_skills or [])
         optional_skills = self.skill_normalizer.normalize_list(jd.optional_skills or [])
-        all_skills = mandatory_skills + optional_skills
+        # Lowercased lookups built once per JD; scoring reuses them per candidate
+        mandatory_lc = {s.lower(): s for s in mandatory_skills}
+        mandatory_set = frozenset(mandatory_lc)
+        optional_set = frozenset(s.lower() for s in optional_skills)
         
         # Get candidates
         candidates = self.rag_processor.get_all_candidates_for_job(jd.job_id)
@@ -218,62 +295,83 @@ class CandidateEvaluator:
         # Limit to max resumes
         candidates = candidates[:settings.MAX_RESUMES_PER_JD]
         
-        # Evaluate each candidate
-        evaluations = []
         jd_text = f"Title: {jd.title}\n\nDescription: {jd.description}"
-        
+
         if jd.education_requirements:
             jd_text += f"\n\nEducation Requirements: {jd.education_requirements}"
-        
-        for candidate in candidates:
-            evaluation = self._evaluate_single_candidate(
-                jd=jd,
+
+        evaluations = []
+        if candidates:
+            # Embed the JD once; every per-candidate retrieval reuses it
+            # instead of re-embedding the same text. Embedding and the
+            # batched Chroma search are blocking, so they run off-loop.
+            jd_embedding = await asyncio.to_thread(self.rag_processor.embed_jd, jd_text)
+
+            # One batched vector search covers all candidates instead of
+            # one Chroma query each
+            contexts_by_id = await asyncio.to_thread(
+                self.rag_processor.get_candidate_contexts_batch,
+                jd.job_id,
+                [c["candidate_id"] for c in candidates],
+                jd_text,
+                jd_embedding
+            )
+            contexts = [contexts_by_id.get(c["candidate_id"], "") for c in candidates]
+
+            # One Groq call per batch of candidates instead of one per
+            # candidate; candidates with no indexed content are scored
+            # without an LLM round-trip
+            with_context = [
+                {
+                    "candidate_id": candidate["candidate_id"],
+                    "candidate_name": candidate["candidate_name"],
+                    "context": context
+                }
+                for candidate, context in zip(candidates, contexts)
+                if context
+            ]
+            llm_evaluations = await self.rag_processor.evaluate_batch_with_llm(
                 jd_text=jd_text,
-                candidate=candidate,
-                role_level=role_level,
+                candidates=with_context,
                 mandatory_skills=mandatory_skills,
-                optional_skills=optional_skills,
-                all_skills=all_skills
-            )
-            evaluations.append(evaluation)
-        
-        # Sort by final score (descending)
+                optional_skills=optional_skills
+            ) if with_context else {}
+
+            for candidate in candidates:
+                evaluation = self._build_evaluation(
+                    candidate=candidate,
+                    llm_evaluation=llm_evaluations.get(candidate["candidate_id"]),
+                    role_level=role_level,
+                    mandatory_skills=mandatory_skills,
+                    mandatory_lc=mandatory_lc,
+                    mandatory_set=mandatory_set,
+                    optional_set=optional_set
+                )
+                evaluations.append(evaluation)
+        
+        # Sort by final score (descending). Downstream consumers rely on
+        # this invariant: top-N endpoints slice without re-sorting and the
+        # summary reads the extremes from the first/last entries.
         evaluations.sort(key=lambda x: x.scores.final_score, reverse=True)
         
         return evaluations
     
-    def _evaluate_single_candidate(
+    def _build_evaluation(
         self,
-        jd: JobDescriptionInput,
-        jd_text: str,
         candidate: Dict[str, Any],
+        llm_evaluation: Optional[Dict[str, Any]],
         role_level: RoleLevel,
         mandatory_skills: List[str],
-        optional_skills: List[str],
-        all_skills: List[str]
+        mandatory_lc: Dict[str, str],
+        mandatory_set: frozenset,
+        optional_set: frozenset
     ) -> CandidateEvaluation:
-        """Evaluate a single candidate."""
-        
+        """Score a candidate from its LLM evaluation (None if no context)."""
+
         candidate_id = candidate["candidate_id"]
         candidate_name = candidate["candidate_name"]
-        
-        # Get candidate context from RAG
-        context, chunks = self.rag_processor.get_candidate_context(
-            job_id=jd.job_id,
-            candidate_id=candidate_id,
-            jd_text=jd_text
-        )
-        
-        # Use LLM for evaluation if we have context
-        if context:
-            llm_evaluation = self.rag_processor.evaluate_with_llm(
-                jd_text=jd_text,
-                candidate_context=context,
-                candidate_name=candidate_name,
-                mandatory_skills=mandatory_skills,
-                optional_skills=optional_skills
-            )
-        else:
+
+        if llm_evaluation is None:
             # No context available
             llm_evaluation = {
                 "matched_skills": [],
@@ -293,26 +391,25 @@ class CandidateEvaluator:
             llm_evaluation.get("matched_skills", [])
         )
         
-        # Calculate missing skills
-        matched_set = set(s.lower() for s in matched_skills)
-        missing_skills = [
-            s for s in mandatory_skills 
-            if s.lower() not in matched_set
-        ]
+        # Lowercased matched set is built once and reused for both the
+        # missing-skills difference and the skills score
+        matched_set = frozenset(s.lower() for s in matched_skills)
+        missing_skills = [mandatory_lc[k] for k in mandatory_lc.keys() - matched_set]
         
-        # Get scores from LLM evaluation or calculate
-        skills_score = float(llm_evaluation.get("skills_score", 0))
+        # Get scores from LLM evaluation
         experience_score = float(llm_evaluation.get("experience_score", 0))
         education_score = float(llm_evaluation.get("education_score", 0))
-        
-        # Recalculate skills score if needed (for consistency)
+
+        # Recalculate the skills score for consistency whenever there are
+        # skills to score; the LLM's figure is only used when there aren't
         if matched_skills or mandatory_skills:
             skills_score = self.score_calculator.calculate_skills_score(
-                matched_skills=matched_skills,
-                missing_skills=missing_skills,
-                mandatory_skills=mandatory_skills,
-                optional_skills=optional_skills
+                matched_set=matched_set,
+                mandatory_set=mandatory_set,
+                optional_set=optional_set
             )
+        else:
+            skills_score = float(llm_evaluation.get("skills_score", 0))
         
         # Build score breakdown
         scores = ScoreBreakdown(
@@ -345,11 +442,11 @@ class CandidateEvaluator:
         
         return evaluation
     
-    def evaluate_single(
+    async def evaluate_single(
         self,
         jd: JobDescriptionInput,
         candidate_id: str
     ) -> Optional[CandidateEvaluation]:
         """Evaluate a single specific candidate."""
-        evaluations = self.evaluate_candidates(jd, candidate_ids=[candidate_id])
+        evaluations = await self.evaluate_candidates(jd, candidate_ids=[candidate_id])
         return evaluations[0] if evaluations else None
\ No newline at end of file
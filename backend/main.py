@@ -2,16 +2,22 @@
 #main.py - FastAPI app and endpoints
 
 import re
-import json
+import os
+import orjson
+import asyncio
+import hashlib
 import logging
+import tempfile
+import tiktoken
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from contextlib import asynccontextmanager
-from io import BytesIO
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Depends, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Depends, UploadFile, File, Form, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from config import settings
 from schemas import (
@@ -24,9 +30,17 @@ from schemas import (
 )
 from evaluation import CandidateEvaluator
 from rag_utils import RAGProcessor
-from utils import generate_job_id, generate_candidate_id, RateLimiter
+from utils import (
+    generate_job_id, generate_candidate_id, hash_text,
+    extract_section_snippet, LRUCache, RateLimiter
+)
 from pdf_extractor import PDFExtractor
-from resume_parser import ResumeParser
+from resume_parser import ResumeParser, parse_resume
+
+
+# Strips a leading ```json fence and trailing ``` from LLM replies in one
+# pass; compiled once instead of per response
+_FENCE_RE = re.compile(r'^```(?:json)?\n?|\n?```$')
 
 
 # Configure logging
@@ -40,16 +54,63 @@ logger = logging.getLogger(__name__)
 #  Application State 
 
 class AppState:
-    """Application state container."""
-    
+    """
+    Application state container.
+
+    All state here is process-local, so the service must run as a single
+    uvicorn worker; with --workers N each worker would see its own copy of
+    jobs, profiles and caches. Scaling out horizontally means swapping
+    these dicts for a shared backend (e.g. Redis hashes keyed by job_id),
+    which is why every access already goes through this container rather
+    than module globals.
+    """
+
+    # Bound on the /analyze-resume content-hash caches
+    ANALYZE_CACHE_MAX = 256
+
     def __init__(self):
         self.rag_processor: Optional[RAGProcessor] = None
         self.evaluator: Optional[CandidateEvaluator] = None
         self.job_descriptions: Dict[str, JobDescriptionInput] = {}
         self.rate_limiter = RateLimiter(max_requests=100, window_seconds=60)
-        self.evaluation_cache: Dict[str, EvaluationResponse] = {}
+        # LRU-bounded: full evaluation responses stay resident only while
+        # they are being served, instead of accumulating per job forever
+        self.evaluation_cache: Dict[str, EvaluationResponse] = LRUCache(maxsize=256)
+        # Summary statistics computed once per evaluation run so the
+        # summary endpoint doesn't re-walk the candidate list per GET
+        self.summary_cache: Dict[str, Dict[str, Any]] = LRUCache(maxsize=256)
+        # Pre-serialized JSON for cached evaluations; repeat GETs return
+        # these bytes directly instead of re-encoding the Pydantic model
+        self.evaluation_json_cache: Dict[str, bytes] = LRUCache(maxsize=256)
         # Store parsed candidate profiles: {job_id: {candidate_id: CandidateProfile}}
         self.candidate_profiles: Dict[str, Dict[str, CandidateProfile]] = {}
+        # Original resume text, stored once per candidate in a side table
+        # instead of travelling with every profile; only the /compare
+        # prompt builder actually needs it
+        self.raw_resume_texts: Dict[str, Dict[str, str]] = {}
+        # Process pool for CPU-bound resume parsing (regex work holds the GIL)
+        self.parse_pool: Optional[ProcessPoolExecutor] = None
+        # /analyze-resume caches: extraction + LLM parse keyed by the
+        # resume's SHA-256, full evaluation keyed by (resume hash, JD hash);
+        # retried uploads of the same file skip both Groq calls
+        self.analyze_cache: Dict[str, tuple] = {}
+        self.analyze_eval_cache: Dict[str, Dict[str, Any]] = {}
+        # Pre-serialized GET /jobs body; None means rebuild on next read
+        self.jobs_json_cache: Optional[bytes] = None
+
+    def invalidate_evaluation_cache(self, job_id: str) -> None:
+        """
+        Drop every cached evaluation for a job.
+
+        Cache keys are prefixed "{job_id}_", so this is the single place
+        that knows the key scheme; all mutating handlers call it instead
+        of each reimplementing the key loop.
+        """
+        prefix = f"{job_id}_"
+        for cache in (self.evaluation_cache, self.summary_cache, self.evaluation_json_cache):
+            stale_keys = [key for key in cache if key.startswith(prefix)]
+            for key in stale_keys:
+                del cache[key]
 
 app_state = AppState()
 
@@ -64,16 +125,39 @@ async def lifespan(app: FastAPI):
     
     try:
         app_state.rag_processor = RAGProcessor()
-        app_state.evaluator = CandidateEvaluator()
+        # The evaluator must share the processor that indexes uploads so
+        # re-indexing invalidates the context cache it reads from
+        app_state.evaluator = CandidateEvaluator(rag_processor=app_state.rag_processor)
         logger.info("Initialized RAG processor and evaluator")
     except Exception as e:
         logger.error(f"Failed to initialize services: {e}")
         raise
-    
+
+    # Size the default executor for the to_thread fan-out in handlers
+    # (Groq calls, embedding, indexing); asyncio's own default of cpu+4
+    # threads queues under the bulk-upload workload. Overridable via
+    # THREAD_POOL_SIZE, capped at 8x cores.
+    loop = asyncio.get_running_loop()
+    thread_pool = ThreadPoolExecutor(
+        max_workers=min(
+            int(os.getenv("THREAD_POOL_SIZE", "64")),
+            (os.cpu_count() or 4) * 8
+        ),
+        thread_name_prefix="ats"
+    )
+    loop.set_default_executor(thread_pool)
+
+    # Resume parsing is pure-Python regex work and GIL-bound, so it gets a
+    # process pool; RAG indexing stays on threads since it is mostly I/O
+    app_state.parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
     yield
-    
+
     # Shutdown
     logger.info("Shutting down ATS Evaluation Engine...")
+    if app_state.parse_pool is not None:
+        app_state.parse_pool.shutdown()
+    thread_pool.shutdown()
 
 
 #  FastAPI App 
@@ -82,7 +166,10 @@ app = FastAPI(
     title="ATS Evaluation Engine",
     description="AI-powered Applicant Tracking System evaluation backend using RAG + Groq",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes large candidate lists several times faster than
+    # stdlib json and handles datetimes natively
+    default_response_class=ORJSONResponse
 )
 
 # CORS Middleware
@@ -99,25 +186,25 @@ app.add_middleware(
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=ErrorResponse(
             error=True,
             message=exc.detail
-        ).model_dump()
+        ).model_dump(mode='json')
     )
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.error(f"Unexpected error: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=ErrorResponse(
             error=True,
             message="Internal server error",
             details={"type": type(exc).__name__}
-        ).model_dump()
+        ).model_dump(mode='json')
     )
 
 
@@ -138,7 +225,15 @@ async def get_evaluator() -> CandidateEvaluator:
 
 
 async def check_rate_limit(client_id: str = Query(default="default")):
-    """Rate limiting dependency."""
+    """
+    Rate limiting dependency.
+
+    The limiter is process-local (see AppState), so the configured limit is
+    per worker; running multiple uvicorn workers multiplies the effective
+    limit. A shared atomic counter (e.g. Redis INCR + EXPIRE) would replace
+    RateLimiter here if the service ever scales out. Checks run on the
+    event loop, so no locking is needed in-process.
+    """
     if not app_state.rate_limiter.is_allowed(client_id):
         raise HTTPException(
             status_code=429,
@@ -189,7 +284,8 @@ async def create_job(
         
         # Store job description
         app_state.job_descriptions[jd.job_id] = jd
-        
+        app_state.jobs_json_cache = None
+
         logger.info(f"Created job: {jd.job_id} - {jd.title}")
         
         return UploadResponse(
@@ -233,12 +329,11 @@ async def update_job(
         
         # Update job description
         app_state.job_descriptions[job_id] = jd
-        
+        app_state.jobs_json_cache = None
+
         # Invalidate evaluation cache for this job
-        cache_keys_to_remove = [key for key in app_state.evaluation_cache.keys() if key.startswith(f"{job_id}_")]
-        for key in cache_keys_to_remove:
-            del app_state.evaluation_cache[key]
-        
+        app_state.invalidate_evaluation_cache(job_id)
+
         logger.info(f"Updated job: {job_id} - {jd.title}")
         
         return UploadResponse(
@@ -255,7 +350,14 @@ async def update_job(
 @app.get("/api/v1/jobs", response_model=List[JobDescriptionInput], tags=["Jobs"])
 async def list_jobs():
     """List all job descriptions."""
-    return list(app_state.job_descriptions.values())
+    # Serve pre-serialized bytes; returning a Response bypasses the
+    # per-job Pydantic re-validation FastAPI would otherwise run on every
+    # GET (response_model stays for the OpenAPI schema)
+    if app_state.jobs_json_cache is None:
+        app_state.jobs_json_cache = orjson.dumps(
+            [jd.model_dump(mode='json') for jd in app_state.job_descriptions.values()]
+        )
+    return Response(content=app_state.jobs_json_cache, media_type="application/json")
 
 
 @app.delete("/api/v1/jobs/{job_id}", response_model=UploadResponse, tags=["Jobs"])
@@ -274,11 +376,11 @@ async def delete_job(
         
         # Delete from state
         del app_state.job_descriptions[job_id]
-        
+        app_state.jobs_json_cache = None
+
         # Clear cache
-        if job_id in app_state.evaluation_cache:
-            del app_state.evaluation_cache[job_id]
-        
+        app_state.invalidate_evaluation_cache(job_id)
+
         return UploadResponse(
             success=True,
             message="Job and associated data deleted successfully"
@@ -321,9 +423,8 @@ async def upload_resume(
         )
         
         # Invalidate cache for this job
-        if job_id in app_state.evaluation_cache:
-            del app_state.evaluation_cache[job_id]
-        
+        app_state.invalidate_evaluation_cache(job_id)
+
         logger.info(f"Indexed resume: {resume.candidate_id} with {chunk_count} chunks")
         
         return UploadResponse(
@@ -361,23 +462,47 @@ async def upload_resumes_bulk(
         )
     
     try:
-        parser = ResumeParser()
-        total_chunks = 0
-        processed = 0
-        
         # Initialize candidate profiles dict for this job if not exists
         if job_id not in app_state.candidate_profiles:
             app_state.candidate_profiles[job_id] = {}
-        
+
+        # Assign IDs up front (must happen before the concurrent fan-out so
+        # responses and profiles agree)
         for resume in bulk_input.resumes:
-            # Generate candidate ID if empty
             if not resume.candidate_id:
                 resume.candidate_id = generate_candidate_id()
-            
-            # Parse resume to extract structured data
-            parsed_data = parser.parse(resume.resume_text, resume.candidate_name)
-            
-            # Create and store candidate profile
+
+        # Parse on the process pool (CPU-bound, GIL-free across cores)
+        loop = asyncio.get_running_loop()
+        parsed_list = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    app_state.parse_pool, parse_resume,
+                    resume.resume_text, resume.candidate_name
+                )
+                for resume in bulk_input.resumes
+            )
+        )
+
+        def _index_one(resume: ResumeInput) -> int:
+            """Index one resume for RAG; runs on the default executor."""
+            return rag_processor.index_resume(
+                job_id=job_id,
+                candidate_id=resume.candidate_id,
+                candidate_name=resume.candidate_name,
+                resume_text=resume.resume_text,
+                metadata=resume.metadata
+            )
+
+        # Index concurrently on threads (mostly embedding / vector-store I/O)
+        chunk_counts = await asyncio.gather(
+            *(asyncio.to_thread(_index_one, resume) for resume in bulk_input.resumes)
+        )
+
+        # Shared state is only written after gather to avoid locking
+        total_chunks = 0
+        processed = 0
+        for resume, parsed_data, chunk_count in zip(bulk_input.resumes, parsed_list, chunk_counts):
             candidate_profile = CandidateProfile(
                 candidate_id=resume.candidate_id,
                 job_id=job_id,
@@ -387,27 +512,17 @@ async def upload_resumes_bulk(
                 experience_years=parsed_data.get("experience_years", 0),
                 experience_summary=parsed_data.get("experience_summary", ""),
                 skills=parsed_data.get("skills", []),
-                education=parsed_data.get("education", []),
-                raw_text=resume.resume_text
+                normalized_skills=_normalize_skill_set(parsed_data.get("skills", [])),
+                education=parsed_data.get("education", [])
             )
             app_state.candidate_profiles[job_id][resume.candidate_id] = candidate_profile
-            
-            # Index the resume for RAG
-            chunk_count = rag_processor.index_resume(
-                job_id=job_id,
-                candidate_id=resume.candidate_id,
-                candidate_name=resume.candidate_name,
-                resume_text=resume.resume_text,
-                metadata=resume.metadata
-            )
-            
+            app_state.raw_resume_texts.setdefault(job_id, {})[resume.candidate_id] = resume.resume_text
             total_chunks += chunk_count
             processed += 1
-        
+
         # Invalidate cache
-        if job_id in app_state.evaluation_cache:
-            del app_state.evaluation_cache[job_id]
-        
+        app_state.invalidate_evaluation_cache(job_id)
+
         logger.info(f"Bulk indexed {processed} resumes with {total_chunks} total chunks")
         
         return UploadResponse(
@@ -457,41 +572,80 @@ async def list_candidates(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def _match_skills(candidate_skills: List[str], job_skills: List[str]) -> Dict[str, Any]:
+def _normalize_skill_set(skills: List[str]) -> frozenset:
+    """Lowercase and strip a skill list into the matching-set shape."""
+    return frozenset(s.lower().strip() for s in skills) - {""}
+
+
+@lru_cache(maxsize=256)
+def _candidate_skill_index(cand_set: frozenset) -> tuple:
     """
-    Match candidate skills with job description skills.
-    
+    Build the partial-match structures for a normalized skill set once.
+
+    Returns (NUL-joined haystack for "job skill appears inside a candidate
+    skill" substring checks, alternation pattern for the reverse
+    "candidate skill appears inside the job skill" direction). Cached so
+    /compare and repeated candidate-detail requests reuse it.
+    """
+    # NUL can't occur inside a skill, so a substring hit never spans two skills
+    haystack = "\x00".join(cand_set)
+    pattern = re.compile(
+        '|'.join(re.escape(s) for s in sorted(cand_set, key=len, reverse=True))
+    ) if cand_set else None
+    return haystack, pattern
+
+
+@lru_cache(maxsize=1)
+def get_parser() -> ResumeParser:
+    """Process-wide ResumeParser; the underlying Groq HTTP client is
+    thread-safe, so one instance serves all requests."""
+    return ResumeParser()
+
+
+@lru_cache(maxsize=1)
+def _token_encoder():
+    """Shared tiktoken encoding for prompt budgeting (loaded on first use)."""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to a token budget instead of a blind character slice."""
+    encoder = _token_encoder()
+    tokens = encoder.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoder.decode(tokens[:max_tokens])
+
+
+def _match_skills(cand_set: frozenset, job_skills: List[str]) -> Dict[str, Any]:
+    """
+    Match a candidate's pre-normalized skill set with job description skills.
+
     Returns:
         Dictionary with matched_skills, missing_skills, and match_percentage
     """
-    # Normalize skills (lowercase for comparison)
-    candidate_skills_lower = [s.lower().strip() for s in candidate_skills]
-    job_skills_lower = [s.lower().strip() for s in job_skills]
-    
+    haystack, pattern = _candidate_skill_index(cand_set)
+
     matched = []
     missing = []
-    
+
     for job_skill in job_skills:
         job_skill_lower = job_skill.lower().strip()
-        # Check for exact match
-        if job_skill_lower in candidate_skills_lower:
+        # Exact hit is a set lookup; the partial checks are one substring
+        # find and one precompiled scan instead of a loop over all
+        # candidate skills per job skill
+        if (
+            job_skill_lower in cand_set
+            or (job_skill_lower and job_skill_lower in haystack)
+            or (pattern is not None and pattern.search(job_skill_lower))
+        ):
             matched.append(job_skill)
         else:
-            # Check for partial match (skill contains keyword or vice versa)
-            found = False
-            for candidate_skill in candidate_skills:
-                candidate_skill_lower = candidate_skill.lower().strip()
-                if (job_skill_lower in candidate_skill_lower or 
-                    candidate_skill_lower in job_skill_lower):
-                    matched.append(job_skill)
-                    found = True
-                    break
-            if not found:
-                missing.append(job_skill)
-    
+            missing.append(job_skill)
+
     # Calculate match percentage
     match_percentage = (len(matched) / len(job_skills) * 100) if job_skills else 0.0
-    
+
     return {
         "matched_skills": matched,
         "missing_skills": missing,
@@ -518,9 +672,12 @@ async def get_candidate_detail(
     profile = app_state.candidate_profiles[job_id][candidate_id]
     jd = app_state.job_descriptions[job_id]
     
-    # Match skills with job description
+    # Match skills with job description against the set normalized at
+    # profile-creation time (fall back for profiles indexed before the
+    # field existed)
     job_skills = (jd.mandatory_skills or []) + (jd.optional_skills or [])
-    skill_match = _match_skills(profile.skills, job_skills)
+    cand_set = profile.normalized_skills or _normalize_skill_set(profile.skills)
+    skill_match = _match_skills(cand_set, job_skills)
     
     # Build response
     response = CandidateDetailResponse(
@@ -556,16 +713,21 @@ async def compare_candidates(
     
     jd = app_state.job_descriptions[job_id]
     
-    # Gather candidate data for LLM
+    # Gather candidate data for LLM; budget the resume slices by tokens so
+    # the prompt stays within ~6000 tokens however many candidates come in
+    resume_token_budget = 6000 // max(len(request.candidate_ids), 1)
+    raw_texts = app_state.raw_resume_texts.get(job_id, {})
     candidate_texts = []
     for cid in request.candidate_ids:
         if cid in app_state.candidate_profiles[job_id]:
             profile = app_state.candidate_profiles[job_id][cid]
-            candidate_texts.append(f"CANDIDATE: {profile.name}\nRESUME:\n{profile.raw_text[:2000]}")
+            resume_slice = _truncate_to_tokens(raw_texts.get(cid, ""), resume_token_budget)
+            candidate_texts.append(f"CANDIDATE: {profile.name}\nRESUME:\n{resume_slice}")
     
     if len(candidate_texts) < 2:
         raise HTTPException(status_code=400, detail="At least 2 valid candidates required for comparison")
 
+    candidates_block = "\n\n".join(candidate_texts)
     comparison_prompt = f"""
     Compare multiple candidates for the same job role.
 
@@ -595,26 +757,52 @@ async def compare_candidates(
     {jd.description}
 
     Candidates:
-    {"\n\n".join(candidate_texts)}
+    {candidates_block}
     """
     
-    parser = ResumeParser()
-    comp_response = parser.groq_client.chat.completions.create(
+    # JSON mode guarantees parseable output, so no fence stripping or
+    # malformed-JSON retries. The parser's Groq client is synchronous, so
+    # the call runs on the executor to keep the event loop free.
+    parser = get_parser()
+    comp_response = await asyncio.to_thread(
+        parser.groq_client.chat.completions.create,
         model=settings.GROQ_MODEL,
-        messages=[{"role": "user", "content": comparison_prompt}],
-        temperature=0.1
+        messages=[
+            {"role": "system", "content": "Return only a JSON object matching the requested schema."},
+            {"role": "user", "content": comparison_prompt}
+        ],
+        temperature=0.1,
+        response_format={"type": "json_object"}
     )
-    comp_content = comp_response.choices[0].message.content.strip()
-    if comp_content.startswith("```"):
-        comp_content = re.sub(r'^```json?\n?', '', comp_content)
-        comp_content = re.sub(r'\n?```$', '', comp_content)
-    
-    return json.loads(comp_content)
+    comp_content = comp_response.choices[0].message.content
+
+    return orjson.loads(comp_content)
 
 
 
 # ==================== PDF Extraction Endpoints ====================
 
+async def _spool_upload(file: UploadFile, tmp, max_size: Optional[int] = None) -> int:
+    """
+    Stream an UploadFile to a temp file in 64 KB chunks.
+
+    Keeps memory constant regardless of PDF size instead of pinning the
+    whole upload in a bytes object per request. Returns the byte count;
+    raises 400 as soon as the stream exceeds max_size.
+    """
+    size = 0
+    while chunk := await file.read(65536):
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File too large. Maximum size is {max_size / (1024*1024):.0f}MB"
+            )
+        tmp.write(chunk)
+    tmp.flush()
+    return size
+
+
 @app.post("/api/v1/extract-pdf", tags=["PDF"])
 async def extract_pdf_text(
     file: UploadFile = File(...),
@@ -651,48 +839,34 @@ async def extract_pdf_text(
         logger.warning(f"Unexpected content type for {file.filename}: {file.content_type}")
     
     try:
-        # Read file content
-        pdf_bytes = await file.read()
-        
-        if len(pdf_bytes) == 0:
-            raise HTTPException(status_code=400, detail="Uploaded file is empty")
-        
-        # Check file size (optional: enforce a reasonable limit)
+        # Stream the upload to disk; the size cap is enforced mid-stream
         max_size = 10 * 1024 * 1024  # 10MB
-        if len(pdf_bytes) > max_size:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Maximum size is {max_size / (1024*1024):.0f}MB"
-            )
-        
-        # Validate PDF structure
-        if not PDFExtractor.validate_pdf(pdf_bytes):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid PDF file. The file may be corrupted or not a valid PDF."
-            )
-        
-        # Extract text
-        extracted_text = PDFExtractor.extract_text(pdf_bytes)
-        
-        # Count pages (re-read to get page count)
-        try:
-            pdf_stream = BytesIO(pdf_bytes)
-            from PyPDF2 import PdfReader
-            reader = PdfReader(pdf_stream)
-            page_count = len(reader.pages)
-        except:
-            page_count = 1  # Fallback if we can't count
-        
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+            file_size = await _spool_upload(file, tmp, max_size=max_size)
+
+            if file_size == 0:
+                raise HTTPException(status_code=400, detail="Uploaded file is empty")
+
+            # Cheap signature check; the extraction call right after is the
+            # real structural validation, so no second full parse here
+            if not PDFExtractor.has_pdf_signature(tmp.name):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid PDF file. The file may be corrupted or not a valid PDF."
+                )
+
+            # Extract text (page count comes from the same parse)
+            extracted_text, page_count = PDFExtractor.extract_text_from_file(tmp.name)
+
         logger.info(
             f"Successfully extracted text from PDF: {file.filename} "
-            f"({len(pdf_bytes)} bytes, {len(extracted_text)} chars, {page_count} pages)"
+            f"({file_size} bytes, {len(extracted_text)} chars, {page_count} pages)"
         )
-        
+
         return {
             "success": True,
             "filename": file.filename,
-            "file_size": len(pdf_bytes),
+            "file_size": file_size,
             "text": extracted_text,
             "text_length": len(extracted_text),
             "page_count": page_count,
@@ -733,16 +907,32 @@ async def analyze_resume(
         raise HTTPException(status_code=400, detail="Only PDF files are accepted")
     
     try:
-        pdf_bytes = await file.read()
-        if not PDFExtractor.validate_pdf(pdf_bytes):
-            raise HTTPException(status_code=400, detail="Invalid PDF file")
-        
-        extracted_text = PDFExtractor.extract_text(pdf_bytes)
-        
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+            await _spool_upload(file, tmp)
+
+            # Identical re-uploads (retries, same resume across jobs) hit
+            # the content-hash cache and skip extraction + both Groq calls
+            tmp.seek(0)
+            pdf_hash = hashlib.file_digest(tmp, "sha256").hexdigest()
+            cached = app_state.analyze_cache.get(pdf_hash)
+
+            if cached is None:
+                if not PDFExtractor.has_pdf_signature(tmp.name):
+                    raise HTTPException(status_code=400, detail="Invalid PDF file")
+
+                extracted_text, _ = PDFExtractor.extract_text_from_file(tmp.name)
+
+        parser = get_parser()
+
         # 2. Extract structured data using LLM
-        parser = ResumeParser()
-        parsed_data = parser.parse_with_llm(extracted_text)
-        
+        if cached is not None:
+            extracted_text, parsed_data = cached
+        else:
+            parsed_data = await asyncio.to_thread(parser.parse_with_llm, extracted_text)
+            if len(app_state.analyze_cache) >= AppState.ANALYZE_CACHE_MAX:
+                app_state.analyze_cache.pop(next(iter(app_state.analyze_cache)))
+            app_state.analyze_cache[pdf_hash] = (extracted_text, parsed_data)
+
         candidate_id = generate_candidate_id()
         candidate_name = parsed_data.get("candidate_name", file.filename.split('.')[0])
         
@@ -755,9 +945,20 @@ async def analyze_resume(
         # 0. Set effective job ID
         effective_job_id = job_id or "default"
 
-        # 3. Compare against JD
+        # 3. Compare against JD (cached per resume content + JD pair, so a
+        # retried upload against the same JD skips the evaluation call too)
+        eval_cache_key = f"{pdf_hash}:{effective_job_id}:{hash_text(jd_text)}"
+        cached_eval = app_state.analyze_eval_cache.get(eval_cache_key)
+
+        # Prompt only with the sections that drive the evaluation; the full
+        # text still goes to the RAG index and the stored profile. Falls
+        # back to the whole resume when no section headings are found.
+        section_snippets = [
+            extract_section_snippet(extracted_text, section)
+            for section in ("experience", "education", "skills")
+        ]
+        resume_for_llm = "\n\n".join(s for s in section_snippets if s) or extracted_text
 
-        # 3. Compare against JD
         evaluation_prompt = f"""
         Perform a professional ATS evaluation of the candidate resume against the job description.
 
@@ -800,19 +1001,37 @@ async def analyze_resume(
         {jd_text}
 
         Candidate Resume:
-        {extracted_text}
+        {resume_for_llm}
         """
         
-        eval_response = parser.groq_client.chat.completions.create(
-            model=settings.GROQ_MODEL,
-            messages=[{"role": "user", "content": evaluation_prompt}],
-            temperature=0.1
-        )
-        eval_content = eval_response.choices[0].message.content.strip()
-        if eval_content.startswith("```"):
-            eval_content = re.sub(r'^```json?\n?', '', eval_content)
-            eval_content = re.sub(r'\n?```$', '', eval_content)
-        eval_data = json.loads(eval_content)
+        if cached_eval is not None:
+            eval_data = dict(cached_eval)
+        else:
+            # Stream the completion and accumulate deltas as they arrive,
+            # so the handler is bound by time-to-first-token plus generation
+            # rather than waiting on a fully buffered response. The blocking
+            # client runs on the executor so concurrent analyze requests fan
+            # out to Groq in parallel instead of serializing on the loop.
+            def _run_evaluation() -> str:
+                eval_stream = parser.groq_client.chat.completions.create(
+                    model=settings.GROQ_MODEL,
+                    messages=[{"role": "user", "content": evaluation_prompt}],
+                    temperature=0.1,
+                    stream=True
+                )
+                return "".join(
+                    chunk.choices[0].delta.content or "" for chunk in eval_stream
+                )
+
+            eval_content = (await asyncio.to_thread(_run_evaluation)).strip()
+            if eval_content.startswith("```"):
+                eval_content = _FENCE_RE.sub('', eval_content)
+            eval_data = orjson.loads(eval_content)
+
+            if len(app_state.analyze_eval_cache) >= AppState.ANALYZE_CACHE_MAX:
+                app_state.analyze_eval_cache.pop(next(iter(app_state.analyze_eval_cache)))
+            app_state.analyze_eval_cache[eval_cache_key] = dict(eval_data)
+
         eval_data["candidate_id"] = candidate_id
 
         # 4. Index for RAG
@@ -834,11 +1053,12 @@ async def analyze_resume(
             email=parsed_data.get("email", ""),
             phone=parsed_data.get("phone", ""),
             skills=eval_data["skills"]["matched"],
+            normalized_skills=_normalize_skill_set(eval_data["skills"]["matched"]),
             education=[eval_data["education"]["candidate"] or ""],
-            experience_summary=eval_data["summary"],
-            raw_text=extracted_text
+            experience_summary=eval_data["summary"]
         )
         app_state.candidate_profiles[effective_job_id][candidate_id] = profile
+        app_state.raw_resume_texts.setdefault(effective_job_id, {})[candidate_id] = extracted_text
 
         # Return the strict evaluation data
         return eval_data
@@ -851,6 +1071,36 @@ async def analyze_resume(
 
 # ==================== Evaluation Endpoints ====================
 
+def _summarize_evaluations(candidates: List[CandidateEvaluation]) -> Dict[str, Any]:
+    """
+    Compute summary statistics over ranked evaluations in one pass.
+
+    Relies on the invariant that evaluate_candidates returns the list
+    sorted by final_score descending, so the extremes are simply the
+    first and last entries.
+    """
+    strong_fit = partial_fit = weak_fit = 0
+    total = 0.0
+    for c in candidates:
+        recommendation = c.overall_recommendation.value
+        if recommendation == "Strong Fit":
+            strong_fit += 1
+        elif recommendation == "Partial Fit":
+            partial_fit += 1
+        elif recommendation == "Weak Fit":
+            weak_fit += 1
+        total += c.scores.final_score
+
+    return {
+        "strong_fit_count": strong_fit,
+        "partial_fit_count": partial_fit,
+        "weak_fit_count": weak_fit,
+        "average_score": round(total / len(candidates), 2) if candidates else 0,
+        "highest_score": candidates[0].scores.final_score if candidates else 0,
+        "lowest_score": candidates[-1].scores.final_score if candidates else 0
+    }
+
+
 @app.post("/api/v1/evaluate", response_model=EvaluationResponse, tags=["Evaluation"])
 async def evaluate_candidates(
     request: EvaluationRequest,
@@ -875,12 +1125,15 @@ async def evaluate_candidates(
         
         if cache_key in app_state.evaluation_cache:
             logger.info(f"Returning cached evaluation for {job_id}")
+            payload = app_state.evaluation_json_cache.get(cache_key)
+            if payload is not None:
+                return Response(content=payload, media_type="application/json")
             return app_state.evaluation_cache[cache_key]
         
         # Run evaluation
         logger.info(f"Starting evaluation for job: {job_id}")
         
-        evaluations = evaluator.evaluate_candidates(
+        evaluations = await evaluator.evaluate_candidates(
             jd=jd,
             candidate_ids=request.candidate_ids
         )
@@ -898,9 +1151,12 @@ async def evaluate_candidates(
             candidates=evaluations
         )
         
-        # Cache the result
+        # Cache the result, with its summary stats and serialized JSON
+        # computed once up front
         app_state.evaluation_cache[cache_key] = response
-        
+        app_state.summary_cache[cache_key] = _summarize_evaluations(evaluations)
+        app_state.evaluation_json_cache[cache_key] = orjson.dumps(response.model_dump(mode='json'))
+
         logger.info(f"Completed evaluation for {len(evaluations)} candidates")
         
         return response
@@ -939,7 +1195,7 @@ async def evaluate_single_candidate(
     jd = app_state.job_descriptions[job_id]
     
     try:
-        evaluation = evaluator.evaluate_single(jd=jd, candidate_id=candidate_id)
+        evaluation = await evaluator.evaluate_single(jd=jd, candidate_id=candidate_id)
         
         if not evaluation:
             raise HTTPException(status_code=404, detail="Candidate not found")
@@ -965,7 +1221,12 @@ async def get_cached_results(job_id: str):
             status_code=404,
             detail="No cached results found. Run evaluation first."
         )
-    
+
+    # Serve the pre-serialized bytes when available; falls back to the
+    # model (and normal response encoding) if only that survived eviction
+    payload = app_state.evaluation_json_cache.get(cache_key)
+    if payload is not None:
+        return Response(content=payload, media_type="application/json")
     return app_state.evaluation_cache[cache_key]
 
 
@@ -1007,29 +1268,21 @@ async def get_results_summary(job_id: str):
         )
     
     cached = app_state.evaluation_cache[cache_key]
-    
-    # Calculate summary statistics
-    strong_fit = sum(1 for c in cached.candidates if c.overall_recommendation.value == "Strong Fit")
-    partial_fit = sum(1 for c in cached.candidates if c.overall_recommendation.value == "Partial Fit")
-    weak_fit = sum(1 for c in cached.candidates if c.overall_recommendation.value == "Weak Fit")
-    
-    scores = [c.scores.final_score for c in cached.candidates]
-    avg_score = sum(scores) / len(scores) if scores else 0
-    
+
+    # Summary stats are precomputed when the evaluation is cached; the
+    # recompute path only runs if the summary was evicted independently
+    summary = app_state.summary_cache.get(cache_key)
+    if summary is None:
+        summary = _summarize_evaluations(cached.candidates)
+        app_state.summary_cache[cache_key] = summary
+
     return {
         "job_id": job_id,
         "job_title": cached.job_title,
         "role_level": cached.role_level.value,
         "total_candidates": cached.total_candidates,
         "evaluation_timestamp": cached.evaluation_timestamp.isoformat(),
-        "summary": {
-            "strong_fit_count": strong_fit,
-            "partial_fit_count": partial_fit,
-            "weak_fit_count": weak_fit,
-            "average_score": round(avg_score, 2),
-            "highest_score": max(scores) if scores else 0,
-            "lowest_score": min(scores) if scores else 0
-        }
+        "summary": summary
     }
 
 
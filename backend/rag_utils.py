@@ -4,14 +4,33 @@ rag_utils.py - RAG retrieval and Groq embedding utilities
 
 import re
 import json
+import orjson
+import asyncio
 import hashlib
+import threading
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import accumulate
 from typing import List, Dict, Any, Optional, Tuple
-from groq import Groq
+import numpy as np
+from groq import AsyncGroq
 import chromadb
 from chromadb.utils import embedding_functions
 
 from config import settings
 
+# Chunker patterns, compiled once at import instead of per call; the two
+# _clean_text passes can't fold into a single sub because their
+# replacements differ (space vs removal)
+_WS_RE = re.compile(r'\s+')
+_STRIP_RE = re.compile(r'[^\w\s.,;:!?@#$%&*()\-+=/\'"]+')
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Chunk-bookkeeping metadata keys stripped from per-candidate listings
+_CANDIDATE_METADATA_EXCLUDE = frozenset(
+    {"candidate_id", "candidate_name", "chunk_index", "total_chunks"}
+)
+
 
 class TextChunker:
     """Utility class for splitting text into chunks."""
@@ -28,57 +47,53 @@ class TextChunker:
         """Split text into overlapping chunks of approximately chunk_size tokens."""
         # Clean the text
         text = self._clean_text(text)
-        
+
         # Split into sentences first for better chunking
         sentences = self._split_into_sentences(text)
-        
+        if not sentences:
+            return []
+
+        # Prefix sums over per-sentence token estimates: the tokens in
+        # sentences[i:j] are cum[j] - cum[i], so chunk boundaries and
+        # overlap starts become binary searches instead of per-sentence
+        # accumulation loops
+        cum = [0]
+        cum.extend(accumulate(self.estimate_tokens(s) for s in sentences))
+        total = len(sentences)
+
         chunks = []
-        current_chunk = []
-        current_size = 0
-        
-        for sentence in sentences:
-            sentence_tokens = self.estimate_tokens(sentence)
-            
-            if current_size + sentence_tokens > self.chunk_size and current_chunk:
-                # Save current chunk
-                chunk_text = ' '.join(current_chunk)
-                chunks.append(chunk_text)
-                
-                # Keep overlap
-                overlap_sentences = []
-                overlap_size = 0
-                for s in reversed(current_chunk):
-                    s_tokens = self.estimate_tokens(s)
-                    if overlap_size + s_tokens <= self.overlap:
-                        overlap_sentences.insert(0, s)
-                        overlap_size += s_tokens
-                    else:
-                        break
-                
-                current_chunk = overlap_sentences
-                current_size = overlap_size
-            
-            current_chunk.append(sentence)
-            current_size += sentence_tokens
-        
-        # Add remaining chunk
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
-        
+        start = 0
+        prev_end = 0
+
+        while True:
+            # Largest end with at most chunk_size tokens in [start, end),
+            # but always at least one sentence past the previous chunk so
+            # the scan advances even when a single sentence is oversized
+            end = max(prev_end + 1, bisect_right(cum, cum[start] + self.chunk_size) - 1)
+            if end >= total:
+                chunks.append(' '.join(sentences[start:]))
+                break
+            chunks.append(' '.join(sentences[start:end]))
+
+            # Carry the longest sentence suffix of this chunk that fits in
+            # the overlap budget into the next chunk
+            start = max(start, bisect_left(cum, cum[end] - self.overlap))
+            prev_end = end
+
         return chunks
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         # Remove special characters but keep punctuation
-        text = re.sub(r'[^\w\s.,;:!?@#$%&*()\-+=/\'"]+', '', text)
+        text = _STRIP_RE.sub('', text)
         return text.strip()
-    
+
     def _split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences."""
         # Simple sentence splitting
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        sentences = _SENT_RE.split(text)
         return [s.strip() for s in sentences if s.strip()]
 
 
@@ -88,10 +103,12 @@ class GroqClient:
     def __init__(self):
         if not settings.GROQ_API_KEY:
             raise ValueError("GROQ_API_KEY not configured")
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+        # Async client: multi-second LLM calls await on the event loop
+        # instead of blocking it, so evaluations fan out concurrently
+        self.client = AsyncGroq(api_key=settings.GROQ_API_KEY)
         self.model = settings.GROQ_MODEL
-    
-    def generate_completion(
+
+    async def generate_completion(
         self,
         prompt: str,
         system_prompt: str = "",
@@ -100,14 +117,14 @@ class GroqClient:
     ) -> str:
         """Generate a completion using Groq LLM."""
         messages = []
-        
+
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
-        
+
         messages.append({"role": "user", "content": prompt})
-        
+
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=temperature,
@@ -117,60 +134,71 @@ class GroqClient:
         except Exception as e:
             raise RuntimeError(f"Groq API error: {str(e)}")
     
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings using Groq.
-        Note: Groq doesn't have a native embedding endpoint, 
-        so we use a workaround with the LLM or fall back to 
+        Note: Groq doesn't have a native embedding endpoint,
+        so we use a workaround with the LLM or fall back to
         a simple embedding function.
+
+        Returns a 2D float32 array; Chroma accepts ndarrays directly and
+        skips per-element unboxing of Python floats.
         """
         # Using a hash-based embedding as fallback
         # In production, use a proper embedding model like sentence-transformers
-        embeddings = []
-        for text in texts:
-            # Create a deterministic embedding based on text content
-            embedding = self._create_simple_embedding(text)
-            embeddings.append(embedding)
-        return embeddings
-    
-    def _create_simple_embedding(self, text: str, dim: int = 384) -> List[float]:
+        if not texts:
+            return np.empty((0, 384), dtype=np.float32)
+        return np.stack([self._create_simple_embedding(text) for text in texts])
+
+    def _create_simple_embedding(self, text: str, dim: int = 384) -> np.ndarray:
         """Create a simple deterministic embedding (for demo purposes)."""
-        # Hash the text to create consistent embeddings
-        text_hash = hashlib.sha256(text.encode()).hexdigest()
-        
-        # Convert hash to embedding vector
-        embedding = []
-        for i in range(0, min(len(text_hash), dim * 2), 2):
-            val = int(text_hash[i:i+2], 16) / 255.0 - 0.5
-            embedding.append(val)
-        
-        # Pad or truncate to desired dimension
-        while len(embedding) < dim:
-            embedding.append(0.0)
-        
-        return embedding[:dim]
+        # SHAKE-256 emits exactly dim digest bytes; frombuffer turns them
+        # into a vector in one C-level cast with no per-element Python work
+        digest = hashlib.shake_256(text.encode()).digest(dim)
+        return np.frombuffer(digest, dtype=np.uint8).astype(np.float32) / np.float32(255.0) - np.float32(0.5)
+
+
+# Process-wide Chroma client and collection cache. Several RAGProcessor
+# instances exist (app state and evaluator); sharing one PersistentClient
+# avoids opening extra SQLite handles, and caching collection objects
+# avoids a metadata round-trip per request.
+_chroma_lock = threading.Lock()
+_chroma_client = None
+_chroma_embedding_function = None
+
+
+def _get_chroma_client():
+    """Return the shared PersistentClient, creating it on first use."""
+    global _chroma_client, _chroma_embedding_function
+    if _chroma_client is None:
+        with _chroma_lock:
+            if _chroma_client is None:
+                # Use default embedding function or custom one
+                _chroma_embedding_function = embedding_functions.DefaultEmbeddingFunction()
+                # Use PersistentClient instead of deprecated Settings pattern
+                _chroma_client = chromadb.PersistentClient(path=settings.CHROMA_PERSIST_DIR)
+    return _chroma_client
+
+
+@lru_cache(maxsize=64)
+def _get_collection(collection_name: str) -> Any:
+    """Get or create a Chroma collection, cached process-wide."""
+    return _get_chroma_client().get_or_create_collection(
+        name=collection_name,
+        embedding_function=_chroma_embedding_function
+    )
 
 
 class ChromaVectorStore:
     """Wrapper for ChromaDB operations."""
-    
+
     def __init__(self):
-        # Use PersistentClient instead of deprecated Settings pattern
-        self.client = chromadb.PersistentClient(path=settings.CHROMA_PERSIST_DIR)
-        
-        # Use default embedding function or custom one
-        self.embedding_function = embedding_functions.DefaultEmbeddingFunction()
-        
-        self._collections: Dict[str, Any] = {}
-    
+        self.client = _get_chroma_client()
+        self.embedding_function = _chroma_embedding_function
+
     def get_or_create_collection(self, collection_name: str) -> Any:
         """Get or create a Chroma collection."""
-        if collection_name not in self._collections:
-            self._collections[collection_name] = self.client.get_or_create_collection(
-                name=collection_name,
-                embedding_function=self.embedding_function
-            )
-        return self._collections[collection_name]
+        return _get_collection(collection_name)
     
     def add_documents(
         self,
@@ -181,67 +209,106 @@ class ChromaVectorStore:
     ) -> None:
         """Add documents to a collection."""
         collection = self.get_or_create_collection(collection_name)
-        
-        # Add in batches to avoid memory issues
-        batch_size = 100
+
+        # Embed everything in one pass so each add is just a write, not
+        # another embedding-function invocation
+        embeddings = self.embedding_function(documents)
+
+        # Most uploads fit a single write; very large ones are split into
+        # transactions of 512 to bound memory. Upsert keeps re-indexing
+        # idempotent now that chunk ids are content hashes.
+        batch_size = 512
+        if len(documents) <= batch_size:
+            collection.upsert(
+                documents=documents,
+                metadatas=metadatas,
+                ids=ids,
+                embeddings=embeddings
+            )
+            return
+
         for i in range(0, len(documents), batch_size):
-            batch_docs = documents[i:i + batch_size]
-            batch_metas = metadatas[i:i + batch_size]
-            batch_ids = ids[i:i + batch_size]
-            
-            collection.add(
-                documents=batch_docs,
-                metadatas=batch_metas,
-                ids=batch_ids
+            collection.upsert(
+                documents=documents[i:i + batch_size],
+                metadatas=metadatas[i:i + batch_size],
+                ids=ids[i:i + batch_size],
+                embeddings=embeddings[i:i + batch_size]
             )
     
     def query(
         self,
         collection_name: str,
-        query_texts: List[str],
+        query_texts: Optional[List[str]] = None,
         n_results: int = 5,
-        where_filter: Optional[Dict[str, Any]] = None
+        where_filter: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[List[Any]] = None
     ) -> Dict[str, Any]:
-        """Query a collection for similar documents."""
+        """
+        Query a collection for similar documents.
+
+        Accepts either raw query texts or precomputed query embeddings;
+        passing embeddings skips Chroma's per-query embedding step.
+        """
         collection = self.get_or_create_collection(collection_name)
-        
-        query_params = {
-            "query_texts": query_texts,
-            "n_results": n_results
-        }
-        
+
+        query_params: Dict[str, Any] = {"n_results": n_results}
+        if query_embeddings is not None:
+            query_params["query_embeddings"] = query_embeddings
+        else:
+            query_params["query_texts"] = query_texts
+
         if where_filter:
             query_params["where"] = where_filter
-        
+
         return collection.query(**query_params)
     
+    def delete_documents(self, collection_name: str, ids: List[str]) -> None:
+        """Delete specific documents from a collection by id."""
+        collection = self.get_or_create_collection(collection_name)
+        collection.delete(ids=ids)
+
     def delete_collection(self, collection_name: str) -> None:
         """Delete a collection."""
         try:
             self.client.delete_collection(collection_name)
-            if collection_name in self._collections:
-                del self._collections[collection_name]
+            # lru_cache has no per-key invalidation; deletes are rare
+            # enough that dropping the whole collection cache is fine
+            _get_collection.cache_clear()
         except Exception:
             pass
     
     def get_all_documents(
         self,
         collection_name: str,
-        where_filter: Optional[Dict[str, Any]] = None
+        where_filter: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None
     ) -> Dict[str, Any]:
-        """Get all documents from a collection."""
+        """
+        Get all documents from a collection.
+
+        Pass include (e.g. ["metadatas"]) to fetch only the columns the
+        caller needs instead of the full documents.
+        """
         collection = self.get_or_create_collection(collection_name)
-        
-        get_params = {}
+
+        get_params: Dict[str, Any] = {}
         if where_filter:
             get_params["where"] = where_filter
-        
+        if include is not None:
+            get_params["include"] = include
+
         return collection.get(**get_params)
 
 
 class RAGProcessor:
     """Main RAG processing class."""
     
+    # Bound on the per-processor candidate-context cache
+    _CONTEXT_CACHE_MAX = 512
+    # Bound on the JD-embedding cache; JDs are small but embeddings for
+    # long-dead jobs shouldn't accumulate
+    _JD_EMBEDDING_CACHE_MAX = 128
+
     def __init__(self):
         self.chunker = TextChunker(
             chunk_size=settings.CHUNK_SIZE,
@@ -249,6 +316,12 @@ class RAGProcessor:
         )
         self.groq_client = GroqClient()
         self.vector_store = ChromaVectorStore()
+        # Context cache keyed by (job_id, candidate_id, jd_text hash);
+        # entries for a job are invalidated when new content is indexed
+        self._context_cache: Dict[Tuple[str, str, str], Tuple[str, List[Dict[str, Any]]]] = {}
+        # JD embeddings keyed by jd_text hash, so repeat evaluation runs
+        # of the same job skip the embedding forward pass entirely
+        self._jd_embedding_cache: Dict[str, List[float]] = {}
     
     def index_resume(
         self,
@@ -265,61 +338,114 @@ class RAGProcessor:
         if not chunks:
             return 0
         
-        # Prepare documents for indexing
+        # Prepare documents for indexing. Ids are content hashes scoped to
+        # the candidate, so duplicated boilerplate within a resume is
+        # stored once and re-uploading the same resume overwrites its
+        # existing chunks instead of appending a second copy. The scope
+        # stays per-candidate because retrieval filters on candidate_id.
         documents = []
         metadatas = []
         ids = []
-        
+        seen_hashes = set()
+
         base_metadata = {
             "job_id": job_id,
             "candidate_id": candidate_id,
             "candidate_name": candidate_name,
             **(metadata or {})
         }
-        
+
         for i, chunk in enumerate(chunks):
-            chunk_id = f"{job_id}_{candidate_id}_chunk_{i}"
+            chunk_hash = hashlib.sha256(chunk.encode()).hexdigest()[:16]
+            if chunk_hash in seen_hashes:
+                continue
+            seen_hashes.add(chunk_hash)
+
             chunk_metadata = {
                 **base_metadata,
                 "chunk_index": i,
                 "total_chunks": len(chunks)
             }
-            
+
             documents.append(chunk)
             metadatas.append(chunk_metadata)
-            ids.append(chunk_id)
-        
-        # Add to vector store
+            ids.append(f"{job_id}_{candidate_id}_{chunk_hash}")
+
+        # Drop chunks from a previous upload of this candidate whose
+        # content is no longer in the resume; the upsert below only
+        # overwrites identical chunks, so without this a modified
+        # re-upload would leave stale text behind for retrieval to mix in
         collection_name = f"job_{job_id}_resumes"
+        existing = self.vector_store.get_all_documents(
+            collection_name,
+            where_filter={"candidate_id": candidate_id},
+            include=[]
+        )
+        new_ids = set(ids)
+        stale_ids = [eid for eid in (existing.get("ids") or []) if eid not in new_ids]
+        if stale_ids:
+            self.vector_store.delete_documents(collection_name, stale_ids)
+
+        # Add to vector store
         self.vector_store.add_documents(
             collection_name=collection_name,
             documents=documents,
             metadatas=metadatas,
             ids=ids
         )
-        
-        return len(chunks)
+
+        # Cached contexts for this job are stale now
+        self._invalidate_context_cache(job_id)
+
+        return len(documents)
+
+    def _invalidate_context_cache(self, job_id: str) -> None:
+        """Drop cached contexts for a job after new content is indexed."""
+        stale_keys = [key for key in self._context_cache if key[0] == job_id]
+        for key in stale_keys:
+            del self._context_cache[key]
     
+    def embed_jd(self, jd_text: str) -> List[float]:
+        """
+        Embed a JD once so it can be reused across per-candidate queries.
+
+        Without this, Chroma re-embeds the same JD text for every candidate
+        retrieval during an evaluation run. The embedding is cached by text
+        hash, so re-running an evaluation for an unchanged JD skips the
+        forward pass too; keying on content means a JD edit naturally
+        misses without explicit invalidation.
+        """
+        key = hashlib.sha256(jd_text.encode()).hexdigest()[:16]
+        embedding = self._jd_embedding_cache.get(key)
+        if embedding is None:
+            embedding = self.vector_store.embedding_function([jd_text])[0]
+            if len(self._jd_embedding_cache) >= self._JD_EMBEDDING_CACHE_MAX:
+                self._jd_embedding_cache.pop(next(iter(self._jd_embedding_cache)))
+            self._jd_embedding_cache[key] = embedding
+        return embedding
+
     def retrieve_relevant_chunks(
         self,
         job_id: str,
         query: str,
         candidate_id: Optional[str] = None,
-        top_k: int = None
+        top_k: int = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """Retrieve relevant chunks for a query."""
         top_k = top_k or settings.TOP_K_CHUNKS
         collection_name = f"job_{job_id}_resumes"
-        
+
         where_filter = None
         if candidate_id:
             where_filter = {"candidate_id": candidate_id}
-        
+
         results = self.vector_store.query(
             collection_name=collection_name,
-            query_texts=[query],
+            query_texts=[query] if query_embedding is None else None,
             n_results=top_k,
-            where_filter=where_filter
+            where_filter=where_filter,
+            query_embeddings=[query_embedding] if query_embedding is not None else None
         )
         
         # Format results
@@ -335,19 +461,132 @@ class RAGProcessor:
         
         return retrieved_chunks
     
+    def retrieve_relevant_chunks_batch(
+        self,
+        job_id: str,
+        query: str,
+        candidate_ids: List[str],
+        top_k: int = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieve relevant chunks for many candidates in one vector search.
+
+        One $in-filtered query replaces N per-candidate queries: one
+        embedding pass and one HNSW traversal instead of N. Results are
+        split by candidate_id metadata and capped at top_k per candidate;
+        a candidate whose chunks all rank below the global cutoff falls
+        back to its own single query so nobody comes back empty-handed.
+        """
+        top_k = top_k or settings.TOP_K_CHUNKS
+        collection_name = f"job_{job_id}_resumes"
+
+        if not candidate_ids:
+            return {}
+        if len(candidate_ids) == 1:
+            cid = candidate_ids[0]
+            return {cid: self.retrieve_relevant_chunks(
+                job_id=job_id, query=query, candidate_id=cid,
+                top_k=top_k, query_embedding=query_embedding
+            )}
+
+        results = self.vector_store.query(
+            collection_name=collection_name,
+            query_texts=[query] if query_embedding is None else None,
+            n_results=top_k * len(candidate_ids),
+            where_filter={"candidate_id": {"$in": candidate_ids}},
+            query_embeddings=[query_embedding] if query_embedding is not None else None
+        )
+
+        by_candidate: Dict[str, List[Dict[str, Any]]] = {cid: [] for cid in candidate_ids}
+        if results and results.get("documents"):
+            for i, doc in enumerate(results["documents"][0]):
+                metadata = results["metadatas"][0][i] if results.get("metadatas") else {}
+                cid = metadata.get("candidate_id")
+                chunks = by_candidate.get(cid)
+                if chunks is None or len(chunks) >= top_k:
+                    continue
+                chunks.append({
+                    "content": doc,
+                    "metadata": metadata,
+                    "distance": results["distances"][0][i] if results.get("distances") else None
+                })
+
+        # Candidates crowded out of the global top-k*N get a direct query
+        for cid, chunks in by_candidate.items():
+            if not chunks:
+                by_candidate[cid] = self.retrieve_relevant_chunks(
+                    job_id=job_id, query=query, candidate_id=cid,
+                    top_k=top_k, query_embedding=query_embedding
+                )
+
+        return by_candidate
+
+    def get_candidate_contexts_batch(
+        self,
+        job_id: str,
+        candidate_ids: List[str],
+        jd_text: str,
+        jd_embedding: Optional[List[float]] = None
+    ) -> Dict[str, str]:
+        """
+        Batched get_candidate_context: one vector search covers every
+        candidate not already in the context cache.
+        """
+        jd_hash = hashlib.sha256(jd_text.encode()).hexdigest()[:16]
+        contexts: Dict[str, str] = {}
+        missing = []
+        for cid in candidate_ids:
+            cached = self._context_cache.get((job_id, cid, jd_hash))
+            if cached is not None:
+                contexts[cid] = cached[0]
+            else:
+                missing.append(cid)
+
+        if missing:
+            chunks_by_candidate = self.retrieve_relevant_chunks_batch(
+                job_id=job_id,
+                query=jd_text,
+                candidate_ids=missing,
+                top_k=settings.TOP_K_CHUNKS * 2,
+                query_embedding=jd_embedding
+            )
+            for cid in missing:
+                relevant_chunks = chunks_by_candidate.get(cid, [])
+                full_context = "\n\n".join(chunk["content"] for chunk in relevant_chunks)
+                if len(self._context_cache) >= self._CONTEXT_CACHE_MAX:
+                    self._context_cache.pop(next(iter(self._context_cache)))
+                self._context_cache[(job_id, cid, jd_hash)] = (full_context, relevant_chunks)
+                contexts[cid] = full_context
+
+        return contexts
+
     def get_candidate_context(
         self,
         job_id: str,
         candidate_id: str,
-        jd_text: str
+        jd_text: str,
+        jd_embedding: Optional[List[float]] = None
     ) -> Tuple[str, List[Dict[str, Any]]]:
-        """Get all relevant context for a candidate based on JD."""
+        """
+        Get all relevant context for a candidate based on JD.
+
+        Callers evaluating many candidates against one JD should pass the
+        result of embed_jd as jd_embedding so the JD is embedded only once.
+        """
+        # Re-evaluations of the same candidate/JD pair skip the vector query
+        cache_key = (job_id, candidate_id, hashlib.sha256(jd_text.encode()).hexdigest()[:16])
+        cached = self._context_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Retrieve chunks relevant to the JD
         relevant_chunks = self.retrieve_relevant_chunks(
             job_id=job_id,
             query=jd_text,
             candidate_id=candidate_id,
-            top_k=settings.TOP_K_CHUNKS * 2  # Get more chunks for comprehensive evaluation
+            top_k=settings.TOP_K_CHUNKS * 2,  # Get more chunks for comprehensive evaluation
+            query_embedding=jd_embedding
         )
         
         # Combine chunks into context
@@ -356,7 +595,11 @@ class RAGProcessor:
             context_parts.append(chunk["content"])
         
         full_context = "\n\n".join(context_parts)
-        
+
+        if len(self._context_cache) >= self._CONTEXT_CACHE_MAX:
+            self._context_cache.pop(next(iter(self._context_cache)))
+        self._context_cache[cache_key] = (full_context, relevant_chunks)
+
         return full_context, relevant_chunks
     
     def get_all_candidates_for_job(self, job_id: str) -> List[Dict[str, Any]]:
@@ -364,9 +607,13 @@ class RAGProcessor:
         collection_name = f"job_{job_id}_resumes"
         
         try:
-            all_docs = self.vector_store.get_all_documents(collection_name)
-            
-            # Extract unique candidates
+            # Only metadata is needed; skip transferring chunk documents
+            all_docs = self.vector_store.get_all_documents(
+                collection_name, include=["metadatas"]
+            )
+
+            # Extract unique candidates; the filtered-metadata dict is
+            # only built the first time a candidate is seen
             candidates = {}
             if all_docs and all_docs.get("metadatas"):
                 for metadata in all_docs["metadatas"]:
@@ -375,15 +622,15 @@ class RAGProcessor:
                         candidates[cid] = {
                             "candidate_id": cid,
                             "candidate_name": metadata.get("candidate_name", "Unknown"),
-                            "metadata": {k: v for k, v in metadata.items() 
-                                       if k not in ["candidate_id", "candidate_name", "chunk_index", "total_chunks"]}
+                            "metadata": {k: v for k, v in metadata.items()
+                                       if k not in _CANDIDATE_METADATA_EXCLUDE}
                         }
-            
+
             return list(candidates.values())
         except Exception:
             return []
     
-    def evaluate_with_llm(
+    async def evaluate_with_llm(
         self,
         jd_text: str,
         candidate_context: str,
@@ -432,20 +679,18 @@ Provide evaluation in this EXACT JSON format:
 Return ONLY the JSON object, no other text."""
 
         try:
-            response = self.groq_client.generate_completion(
+            response = await self.groq_client.generate_completion(
                 prompt=evaluation_prompt,
                 system_prompt=system_prompt,
                 temperature=0.1
             )
-            
-            # Parse JSON from response
-            # Clean potential markdown formatting
-            response = response.strip()
-            if response.startswith("```"):
-                response = re.sub(r'^```json?\n?', '', response)
-                response = re.sub(r'\n?```$', '', response)
-            
-            evaluation = json.loads(response)
+
+            # Parse JSON from response. Slicing from the first { to the
+            # last } drops any markdown fencing in one pass, and orjson
+            # parses the few-KB payload several times faster than json.
+            start = response.find('{')
+            end = response.rfind('}')
+            evaluation = orjson.loads(response[start:end + 1])
             return evaluation
             
         except json.JSONDecodeError as e:
@@ -474,4 +719,143 @@ Return ONLY the JSON object, no other text."""
                 "strengths": [],
                 "weaknesses": ["Evaluation failed"],
                 "confidence_notes": f"LLM evaluation failed: {str(e)}"
-            }
\ No newline at end of file
+            }
+
+    async def evaluate_batch_with_llm(
+        self,
+        jd_text: str,
+        candidates: List[Dict[str, Any]],
+        mandatory_skills: List[str],
+        optional_skills: List[str],
+        batch_size: int = 5
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Evaluate several candidates per Groq call.
+
+        candidates is a list of dicts with candidate_id, candidate_name and
+        context keys. Grouping candidates into one prompt amortizes the
+        network round-trip and the fixed prompt preamble across the batch,
+        and all batches run concurrently against the async client so total
+        latency is one round-trip, not one per batch. Returns a mapping of
+        candidate_id to the same evaluation dict shape produced by
+        evaluate_with_llm; any batch whose JSON cannot be parsed falls back
+        to per-candidate calls.
+        """
+        batches = [candidates[start:start + batch_size]
+                   for start in range(0, len(candidates), batch_size)]
+        batch_results = await asyncio.gather(
+            *(self._evaluate_candidate_batch(
+                jd_text, batch, mandatory_skills, optional_skills
+            ) for batch in batches)
+        )
+
+        results: Dict[str, Dict[str, Any]] = {}
+        missing: List[Dict[str, Any]] = []
+        for parsed, skipped in batch_results:
+            results.update(parsed)
+            missing.extend(skipped)
+
+        # Candidates the model skipped (or whole unparseable batches) fall
+        # back to concurrent single-candidate calls
+        if missing:
+            fallbacks = await asyncio.gather(
+                *(self.evaluate_with_llm(
+                    jd_text=jd_text,
+                    candidate_context=candidate["context"],
+                    candidate_name=candidate["candidate_name"],
+                    mandatory_skills=mandatory_skills,
+                    optional_skills=optional_skills
+                ) for candidate in missing)
+            )
+            for candidate, evaluation in zip(missing, fallbacks):
+                results[candidate["candidate_id"]] = evaluation
+
+        return results
+
+    async def _evaluate_candidate_batch(
+        self,
+        jd_text: str,
+        batch: List[Dict[str, Any]],
+        mandatory_skills: List[str],
+        optional_skills: List[str]
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Run one multi-candidate Groq call.
+
+        Returns (parsed evaluations by candidate_id, candidates needing a
+        single-call fallback).
+        """
+        system_prompt = """You are an AI-powered ATS evaluation engine. Evaluate each candidate strictly based on the provided resume content and job description.
+
+RULES:
+- Use ONLY the provided information
+- Do NOT hallucinate or assume missing details
+- Normalize skill synonyms (e.g., JS → JavaScript)
+- Penalize missing mandatory skills heavily
+- Be objective and unbiased
+- Return ONLY a valid JSON array"""
+
+        candidate_blocks = []
+        for candidate in batch:
+            candidate_blocks.append(
+                f"CANDIDATE ID: {candidate['candidate_id']}\n"
+                f"NAME: {candidate['candidate_name']}\n"
+                f"RESUME CONTENT:\n{candidate['context']}"
+            )
+
+        evaluation_prompt = f"""
+Evaluate each of the following candidates against the job description.
+
+JOB DESCRIPTION:
+{jd_text}
+
+MANDATORY SKILLS: {json.dumps(mandatory_skills)}
+OPTIONAL SKILLS: {json.dumps(optional_skills)}
+
+{chr(10).join(candidate_blocks)}
+
+Provide the evaluations as a JSON array with one object per candidate, in this EXACT format:
+[
+    {{
+        "candidate_id": "<the candidate id given above>",
+        "matched_skills": ["list of skills found in resume that match JD"],
+        "missing_skills": ["list of required skills NOT found in resume"],
+        "skills_score": <0-100 number>,
+        "experience_summary": "brief summary of relevant experience",
+        "experience_score": <0-100 number>,
+        "education_details": "education and certifications found",
+        "education_score": <0-100 number>,
+        "strengths": ["list of 2-4 key strengths"],
+        "weaknesses": ["list of 1-3 weaknesses or gaps"],
+        "confidence_notes": "brief justification based on resume evidence"
+    }}
+]
+
+Return ONLY the JSON array, no other text."""
+
+        try:
+            response = await self.groq_client.generate_completion(
+                prompt=evaluation_prompt,
+                system_prompt=system_prompt,
+                temperature=0.1
+            )
+
+            # Slice from the first [ to the last ] to drop any markdown
+            # fencing, then parse with orjson
+            start = response.find('[')
+            end = response.rfind(']')
+            parsed = orjson.loads(response[start:end + 1])
+            if not isinstance(parsed, list):
+                raise ValueError("Expected a JSON array of evaluations")
+
+            batch_ids = {c["candidate_id"] for c in batch}
+            results: Dict[str, Dict[str, Any]] = {}
+            for entry in parsed:
+                candidate_id = entry.pop("candidate_id", None)
+                if candidate_id in batch_ids:
+                    results[candidate_id] = entry
+
+            missing = [c for c in batch if c["candidate_id"] not in results]
+            return results, missing
+        except Exception:
+            return {}, list(batch)
\ No newline at end of file
@@ -4,17 +4,43 @@ resume_parser.py - Resume parsing and structured data extraction
 
 import re
 import logging
-import json
+import orjson
 from typing import Dict, List, Optional, Any
 from utils import (
     extract_email, extract_phone, extract_years_of_experience,
-    clean_text
+    clean_text, hash_text, LRUCache
 )
 from config import settings
 from groq import Groq
 
 logger = logging.getLogger(__name__)
 
+# Strips a leading ```json fence and trailing ``` from LLM replies in
+# one substitution, compiled once instead of two re.sub calls per reply
+_MD_FENCE_RE = re.compile(r'^```(?:json)?\n?|\n?```$')
+
+# Parser instance for the worker-side entry point below; ResumeParser holds a
+# Groq client and is not picklable, so each process builds its own lazily
+_worker_parser: Optional["ResumeParser"] = None
+
+# LLM parse results keyed by content hash: re-uploads of an identical
+# resume skip the Groq round-trip entirely. Keyed on model too, so a
+# config change doesn't serve stale parses.
+_LLM_PARSE_CACHE: LRUCache = LRUCache(maxsize=1024)
+
+
+def parse_resume(resume_text: str, candidate_name: str) -> Dict[str, Any]:
+    """
+    Module-level parse entry point, safe to submit to a ProcessPoolExecutor.
+
+    Only the two text arguments cross the process boundary; the parser
+    itself is created once per worker process and reused.
+    """
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ResumeParser()
+    return _worker_parser.parse(resume_text, candidate_name)
+
 
 class ResumeParser:
     """Parse resume text and extract structured candidate information."""
@@ -35,13 +61,65 @@ class ResumeParser:
         "Git", "Linux", "Agile", "Scrum", "JIRA", "Confluence"
     ]
     
-    # Education patterns
-    EDUCATION_PATTERNS = [
-        r'\b(B\.?S\.?|B\.?A\.?|B\.?Tech|Bachelor)\b',
-        r'\b(M\.?S\.?|M\.?A\.?|M\.?Tech|M\.?B\.?A\.?|Master)\b',
-        r'\b(Ph\.?D\.?|Doctorate|PhD)\b',
-        r'\b(Associate|Diploma|Certificate)\b'
-    ]
+    # All patterns below are compiled once at class load; the extraction
+    # methods run per resume and would otherwise pay a re-cache lookup
+    # (and a re.escape per skill) on every call.
+    # Every degree keyword lives in one alternation so extraction is a
+    # single pass instead of one scan per degree tier
+    _EDU_DEGREE_RE = re.compile(
+        r'\b(?:B\.?S\.?|B\.?A\.?|B\.?Tech|Bachelor'
+        r'|M\.?S\.?|M\.?A\.?|M\.?Tech|M\.?B\.?A\.?|Master'
+        r'|Ph\.?D\.?|Doctorate|PhD'
+        r'|Associate|Diploma|Certificate)\b',
+        re.IGNORECASE
+    )
+
+    # Section headings are matched by one alternation per section instead
+    # of one full-text scan per heading, with bounded quantifiers so the
+    # capture can't backtrack catastrophically or run away on adversarial
+    # input. Longer headings come first so e.g. "technical skills" isn't
+    # claimed by the bare "skills" alternative. No line anchor: clean_text
+    # collapses newlines before these patterns ever see the text.
+    _SKILLS_SECTION_RE = re.compile(
+        r'\b(?:technical\s+skills?|skills?|competencies?)[ \t]*:?[ \t]*\n?'
+        r'((?:[^\n]{0,500}\n?){0,10})',
+        re.IGNORECASE
+    )
+
+    _EDUCATION_SECTION_RE = re.compile(
+        r'\b(?:academic\s+background|education)[ \t]*:?[ \t]*\n?'
+        r'((?:[^\n]{0,500}\n?){0,10})',
+        re.IGNORECASE
+    )
+
+    _SUMMARY_SECTION_RE = re.compile(
+        r'\b(?:summary|objective|profile|about)[ \t]*:?[ \t]*\n?'
+        r'((?:[^\n]{0,500}\n?){0,5})',
+        re.IGNORECASE
+    )
+
+    # One longest-first alternation folds all keyword searches into a
+    # single linear pass over the text instead of one scan per keyword;
+    # longest-first ordering keeps e.g. JavaScript from being shadowed
+    # by Java at the same position
+    _SKILL_ALTERNATION_RE = re.compile(
+        r'\b(?:' + '|'.join(
+            re.escape(s.lower())
+            for s in sorted(SKILL_KEYWORDS, key=len, reverse=True)
+        ) + r')\b',
+        re.IGNORECASE
+    )
+    _SKILL_CANONICAL = {s.lower(): s for s in SKILL_KEYWORDS}
+
+    _CAPITALIZED_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+    # Technical-term filter for capitalized candidates, folded into one
+    # compiled alternation instead of a Python any() loop that rebuilt
+    # its keyword list on every candidate
+    _TECH_TERM_RE = re.compile(
+        r'api|framework|library|database|server|cloud|devops|frontend|backend|fullstack',
+        re.IGNORECASE
+    )
+    _WS_RE = re.compile(r'\s+')
 
     def __init__(self):
         self.groq_client = None
@@ -61,18 +139,17 @@ class ResumeParser:
         """
         # Clean text
         text = clean_text(resume_text)
-        text_lower = text.lower()
-        
+
         # Extract basic information
         email = extract_email(text)
         phone = extract_phone(text)
         experience_years = extract_years_of_experience(text)
-        
+
         # Extract skills
-        skills = self._extract_skills(text, text_lower)
-        
+        skills = self._extract_skills(text)
+
         # Extract education
-        education = self._extract_education(text, text_lower)
+        education = self._extract_education(text)
         
         # Extract experience summary (first few lines or summary section)
         experience_summary = self._extract_experience_summary(text)
@@ -84,118 +161,78 @@ class ResumeParser:
             "experience_years": experience_years or 0,
             "experience_summary": experience_summary,
             "skills": skills,
-            "education": education,
-            "raw_text": resume_text
+            "education": education
         }
     
-    def _extract_skills(self, text: str, text_lower: str) -> List[str]:
+    def _extract_skills(self, text: str) -> List[str]:
         """Extract skills from resume text."""
         found_skills = set()
-        
-        # Check for skills section
-        skills_section_patterns = [
-            r'skills?\s*:?\s*([^\n]+(?:\n[^\n]+){0,10})',
-            r'technical\s+skills?\s*:?\s*([^\n]+(?:\n[^\n]+){0,10})',
-            r'competencies?\s*:?\s*([^\n]+(?:\n[^\n]+){0,10})'
-        ]
-        
+
+        # Check for skills section; the compiled pattern is already
+        # case-insensitive, so no lowercase copy of the text is needed
         skills_text = ""
-        for pattern in skills_section_patterns:
-            match = re.search(pattern, text_lower, re.IGNORECASE | re.MULTILINE)
-            if match:
-                skills_text = match.group(1)
-                break
-        
+        match = self._SKILLS_SECTION_RE.search(text)
+        if match:
+            skills_text = match.group(1)
+
         # If no skills section found, search entire text
         if not skills_text:
             skills_text = text
-        
-        # Find known skills
-        for skill in self.SKILL_KEYWORDS:
-            if re.search(r'\b' + re.escape(skill.lower()) + r'\b', skills_text, re.IGNORECASE):
-                found_skills.add(skill)
-        
+
+        # Find known skills in one pass
+        for match in self._SKILL_ALTERNATION_RE.finditer(skills_text):
+            found_skills.add(self._SKILL_CANONICAL[match.group(0).lower()])
+
         # Also look for common skill patterns (words that appear frequently)
-        # Extract capitalized words/phrases that might be skills
-        capitalized_pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b'
-        potential_skills = re.findall(capitalized_pattern, skills_text)
-        
-        # Filter potential skills (common technical terms)
-        for skill_candidate in potential_skills:
-            skill_lower = skill_candidate.lower()
-            # Common technical terms
-            if any(keyword in skill_lower for keyword in [
-                'api', 'framework', 'library', 'database', 'server',
-                'cloud', 'devops', 'frontend', 'backend', 'fullstack'
-            ]):
-                if len(skill_candidate) > 2 and len(skill_candidate) < 30:
-                    found_skills.add(skill_candidate)
-        
+        # Extract capitalized words/phrases that might be skills, keeping
+        # those containing a common technical term
+        for skill_candidate in self._CAPITALIZED_RE.findall(skills_text):
+            if 2 < len(skill_candidate) < 30 and self._TECH_TERM_RE.search(skill_candidate):
+                found_skills.add(skill_candidate)
+
         return sorted(list(found_skills))
     
-    def _extract_education(self, text: str, text_lower: str) -> List[str]:
+    def _extract_education(self, text: str) -> List[str]:
         """Extract education information."""
         education_items = []
-        
+
         # Look for education section
-        education_section_patterns = [
-            r'education\s*:?\s*([^\n]+(?:\n[^\n]+){0,10})',
-            r'academic\s+background\s*:?\s*([^\n]+(?:\n[^\n]+){0,10})'
-        ]
-        
         education_text = ""
-        for pattern in education_section_patterns:
-            match = re.search(pattern, text_lower, re.IGNORECASE | re.MULTILINE)
-            if match:
-                education_text = match.group(1)
-                break
-        
+        match = self._EDUCATION_SECTION_RE.search(text)
+        if match:
+            education_text = match.group(1)
+
         # If no education section, search entire text
         if not education_text:
             education_text = text
-        
-        # Extract degree types
-        for pattern in self.EDUCATION_PATTERNS:
-            matches = re.finditer(pattern, education_text, re.IGNORECASE)
-            for match in matches:
-                # Get context around the match (degree name)
-                start = max(0, match.start() - 50)
-                end = min(len(education_text), match.end() + 100)
-                context = education_text[start:end].strip()
-                
-                # Extract degree line
-                lines = context.split('\n')
-                for line in lines:
-                    if match.group(0).lower() in line.lower():
-                        cleaned = line.strip()
-                        if cleaned and cleaned not in education_items:
-                            education_items.append(cleaned)
-                            break
-        
-        return education_items[:5]  # Limit to 5 items
+
+        # Extract degree mentions with their surrounding context in one
+        # pass; clean_text collapses newlines, so the bounded slice around
+        # each match plays the role the containing line used to
+        for match in self._EDU_DEGREE_RE.finditer(education_text):
+            start = max(0, match.start() - 50)
+            end = min(len(education_text), match.end() + 100)
+            context = education_text[start:end].strip()
+            if context and context not in education_items:
+                education_items.append(context)
+                if len(education_items) == 5:  # Limit to 5 items
+                    break
+
+        return education_items
     
     def _extract_experience_summary(self, text: str) -> str:
         """Extract experience summary from resume."""
         # Look for summary/objective section
-        summary_patterns = [
-            r'summary\s*:?\s*([^\n]+(?:\n[^\n]+){0,5})',
-            r'objective\s*:?\s*([^\n]+(?:\n[^\n]+){0,5})',
-            r'profile\s*:?\s*([^\n]+(?:\n[^\n]+){0,5})',
-            r'about\s*:?\s*([^\n]+(?:\n[^\n]+){0,5})'
-        ]
-        
-        text_lower = text.lower()
-        for pattern in summary_patterns:
-            match = re.search(pattern, text_lower, re.IGNORECASE | re.MULTILINE)
-            if match:
-                summary = match.group(1).strip()
-                # Clean up summary
-                summary = re.sub(r'\s+', ' ', summary)
-                if len(summary) > 50:  # Valid summary
-                    return summary[:500]  # Limit length
-        
+        match = self._SUMMARY_SECTION_RE.search(text)
+        if match:
+            summary = match.group(1).strip()
+            # Clean up summary
+            summary = self._WS_RE.sub(' ', summary)
+            if len(summary) > 50:  # Valid summary
+                return summary[:500]  # Limit length
+
         # If no summary found, use first 300 characters
-        cleaned = re.sub(r'\s+', ' ', text.strip())
+        cleaned = self._WS_RE.sub(' ', text.strip())
         return cleaned[:300] + "..." if len(cleaned) > 300 else cleaned
 
     def parse_with_llm(self, resume_text: str) -> Dict[str, Any]:
@@ -204,6 +241,11 @@ class ResumeParser:
             logger.warning("Groq client not initialized, falling back to regex parser")
             return self.parse(resume_text, "Unknown")
 
+        cache_key = hash_text(f"{settings.GROQ_MODEL}:{resume_text}")
+        cached = _LLM_PARSE_CACHE.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
         prompt = f"""
         Extract structured information from the following resume text.
         
@@ -230,13 +272,17 @@ class ResumeParser:
                 temperature=0.1
             )
             content = response.choices[0].message.content.strip()
-            
+
             # Clean potential markdown
             if content.startswith("```"):
-                content = re.sub(r'^```json?\n?', '', content)
-                content = re.sub(r'\n?```$', '', content)
-            
-            return json.loads(content)
+                content = _MD_FENCE_RE.sub('', content)
+
+            parsed = orjson.loads(content)
+            # Only successful parses are cached; a copy is returned so
+            # callers can't mutate the cached entry
+            _LLM_PARSE_CACHE[cache_key] = parsed
+            return dict(parsed)
         except Exception as e:
             logger.error(f"LLM parsing failed: {e}")
             return self.parse(resume_text, "Unknown")
+
@@ -2,8 +2,9 @@
 schemas.py - Pydantic models for request and response JSON
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import List, Optional, Dict, Any, FrozenSet
+from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 
@@ -31,13 +32,13 @@ class JobDescriptionInput(BaseModel):
     job_id: Optional[str] = Field(default=None, description="Unique job identifier")
     title: str = Field(..., description="Job title")
     description: str = Field(..., description="Full job description text")
-    mandatory_skills: Optional[List[str]] = Field(default=[], description="List of required skills")
-    optional_skills: Optional[List[str]] = Field(default=[], description="List of nice-to-have skills")
+    mandatory_skills: Optional[List[str]] = Field(default_factory=list, description="List of required skills")
+    optional_skills: Optional[List[str]] = Field(default_factory=list, description="List of nice-to-have skills")
     min_experience_years: Optional[int] = Field(default=0, description="Minimum years of experience")
     education_requirements: Optional[str] = Field(default=None, description="Education requirements")
-    
-    class Config:
-        json_schema_extra = {
+
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "job_id": "JD-001",
                 "title": "Senior Python Developer",
@@ -48,6 +49,7 @@ class JobDescriptionInput(BaseModel):
                 "education_requirements": "Bachelor's degree in Computer Science or related field"
             }
         }
+    )
 
 
 class ResumeInput(BaseModel):
@@ -55,9 +57,10 @@ class ResumeInput(BaseModel):
     candidate_id: str = Field(..., description="Unique candidate identifier")
     candidate_name: str = Field(..., description="Candidate's full name")
     resume_text: str = Field(..., description="Full text content of the resume")
-    metadata: Optional[Dict[str, Any]] = Field(default={}, description="Additional metadata")
-    
-    @validator('metadata')
+    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional metadata")
+
+    @field_validator('metadata')
+    @classmethod
     def validate_pdf_file(cls, v):
         """Validate that the resume file is a PDF (if metadata is provided)."""
         # Allow empty metadata dict
@@ -77,9 +80,9 @@ class ResumeInput(BaseModel):
             raise ValueError(f"Invalid file extension: {file_extension}. Only .pdf files are accepted.")
         
         return v
-    
-    class Config:
-        json_schema_extra = {
+
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "candidate_id": "CAND-001",
                 "candidate_name": "John Doe",
@@ -92,6 +95,7 @@ class ResumeInput(BaseModel):
                 }
             }
         }
+    )
 
 
 class BulkResumeInput(BaseModel):
@@ -99,7 +103,8 @@ class BulkResumeInput(BaseModel):
     job_id: str = Field(..., description="Associated job ID")
     resumes: List[ResumeInput] = Field(..., description="List of resumes")
     
-    @validator('resumes')
+    @field_validator('resumes')
+    @classmethod
     def validate_resume_count(cls, v):
         if len(v) > 50:
             raise ValueError("Maximum 50 resumes allowed per batch")
@@ -128,16 +133,16 @@ class CandidateEvaluation(BaseModel):
     candidate_name: str = Field(..., description="Candidate's full name")
     role_level: RoleLevel = Field(..., description="Inferred role level from JD")
     scores: ScoreBreakdown = Field(..., description="Score breakdown")
-    matched_skills: List[str] = Field(default=[], description="Skills found in resume matching JD")
-    missing_skills: List[str] = Field(default=[], description="Required skills missing from resume")
+    matched_skills: List[str] = Field(default_factory=list, description="Skills found in resume matching JD")
+    missing_skills: List[str] = Field(default_factory=list, description="Required skills missing from resume")
     relevant_experience: str = Field(default="", description="Summary of relevant experience")
-    strengths: List[str] = Field(default=[], description="Key strengths identified")
-    weaknesses: List[str] = Field(default=[], description="Areas of concern")
+    strengths: List[str] = Field(default_factory=list, description="Key strengths identified")
+    weaknesses: List[str] = Field(default_factory=list, description="Areas of concern")
     overall_recommendation: Recommendation = Field(..., description="Fit recommendation")
     confidence_notes: str = Field(default="", description="Justification based on resume evidence")
-    
-    class Config:
-        json_schema_extra = {
+
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "candidate_id": "CAND-001",
                 "candidate_name": "John Doe",
@@ -157,6 +162,7 @@ class CandidateEvaluation(BaseModel):
                 "confidence_notes": "Candidate shows strong alignment with core requirements."
             }
         }
+    )
 
 
 class EvaluationResponse(BaseModel):
@@ -167,9 +173,9 @@ class EvaluationResponse(BaseModel):
     total_candidates: int = Field(..., description="Total candidates evaluated")
     evaluation_timestamp: datetime = Field(default_factory=datetime.utcnow)
     candidates: List[CandidateEvaluation] = Field(..., description="Ranked candidate evaluations")
-    
-    class Config:
-        json_schema_extra = {
+
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "job_id": "JD-001",
                 "job_title": "Senior Python Developer",
@@ -179,6 +185,7 @@ class EvaluationResponse(BaseModel):
                 "candidates": []
             }
         }
+    )
 
 
 class UploadResponse(BaseModel):
@@ -201,21 +208,30 @@ class HealthCheckResponse(BaseModel):
     status: str = Field(default="healthy")
     version: str = Field(default="1.0.0")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
-    services: Dict[str, str] = Field(default={})
+    services: Dict[str, str] = Field(default_factory=dict)
 
 
-class CandidateProfile(BaseModel):
-    """Parsed candidate profile data."""
-    candidate_id: str = Field(..., description="Unique candidate identifier")
-    job_id: str = Field(..., description="Job ID this candidate is associated with")
-    name: str = Field(..., description="Candidate's full name")
-    email: str = Field(default="", description="Candidate's email")
-    phone: str = Field(default="", description="Candidate's phone number")
-    experience_years: int = Field(default=0, description="Years of experience")
-    experience_summary: str = Field(default="", description="Experience summary")
-    skills: List[str] = Field(default=[], description="List of skills")
-    education: List[str] = Field(default=[], description="Education details")
-    raw_text: str = Field(default="", description="Original resume text")
+@dataclass(slots=True)
+class CandidateProfile:
+    """
+    Parsed candidate profile data.
+
+    Internal store object, never a request/response body, so it's a slotted
+    dataclass rather than a Pydantic model: instantiation skips validation
+    (all fields come from our own parsers) and slot storage halves the
+    per-profile memory for large candidate pools.
+    """
+    candidate_id: str
+    job_id: str
+    name: str
+    email: str = ""
+    phone: str = ""
+    experience_years: int = 0
+    experience_summary: str = ""
+    skills: List[str] = field(default_factory=list)
+    # Lowercased, stripped skills precomputed at parse time for matching
+    normalized_skills: FrozenSet[str] = frozenset()
+    education: List[str] = field(default_factory=list)
 
 
 class CandidateDetailResponse(BaseModel):
@@ -226,17 +242,17 @@ class CandidateDetailResponse(BaseModel):
     phone: str = Field(default="", description="Candidate's phone number")
     experience_years: int = Field(default=0, description="Years of experience")
     experience_summary: str = Field(default="", description="Experience summary")
-    skills: List[str] = Field(default=[], description="List of skills")
-    education: List[str] = Field(default=[], description="Education details")
-    matched_skills: List[str] = Field(default=[], description="Skills matching job description")
-    missing_skills: List[str] = Field(default=[], description="Skills missing from resume")
+    skills: List[str] = Field(default_factory=list, description="List of skills")
+    education: List[str] = Field(default_factory=list, description="Education details")
+    matched_skills: List[str] = Field(default_factory=list, description="Skills matching job description")
+    missing_skills: List[str] = Field(default_factory=list, description="Skills missing from resume")
     match_percentage: float = Field(default=0.0, ge=0, le=100, description="Skill match percentage")
 
 
 class CompareRequest(BaseModel):
     """Request model for candidate comparison."""
     job_id: str = Field(..., description="Job ID")
-    candidate_ids: List[str] = Field(..., min_items=2, description="List of candidate IDs to compare")
+    candidate_ids: List[str] = Field(..., min_length=2, description="List of candidate IDs to compare")
 
 
 class CompareResponse(BaseModel):
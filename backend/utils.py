@@ -4,11 +4,39 @@ utils.py - Helper utilities
 
 import re
 import hashlib
+import time
 import uuid
+import orjson
+from collections import OrderedDict, defaultdict, deque
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 
+# Patterns compiled once at import; calling re.search with a string
+# pattern pays an internal cache lookup on every call
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_PHONE_RE = re.compile(r'[\+]?[(]?[0-9]{1,3}[)]?[-\s\.]?[0-9]{3}[-\s\.]?[0-9]{4,6}')
+# One alternation covers "<n> years/yrs of experience" and
+# "experience: <n> years" in a single scan; trying the variants as
+# separate patterns meant three full passes over text with no mention
+_YOE_RE = re.compile(
+    r'(?:(\d+)\+?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)'
+    r'|experience\s*[:of]?\s*(\d+)\+?\s*years?)',
+    re.IGNORECASE
+)
+_WS_RE = re.compile(r'\s+')
+# Control characters are handled with str.translate — a single C-level
+# pass — rather than a regex character-class substitution. The ones \s
+# matches (\x0b, \x0c, \x1c-\x1f, \x85; e.g. form feeds between pages of
+# extracted text) become spaces so adjacent words aren't glued together;
+# the rest are deleted outright.
+_CTRL_TABLE = dict.fromkeys(
+    [*range(0, 9), 11, 12, *range(14, 32), *range(0x7f, 0xa0)], None
+)
+_CTRL_TABLE.update(dict.fromkeys([11, 12, *range(0x1c, 0x20), 0x85], ' '))
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+
+
 def generate_job_id() -> str:
     """Generate a unique job ID."""
     return f"JD-{uuid.uuid4().hex[:8].upper()}"
@@ -20,49 +48,88 @@ def generate_candidate_id() -> str:
 
 
 def hash_text(text: str) -> str:
-    """Generate a hash of text content."""
-    return hashlib.sha256(text.encode()).hexdigest()[:16]
+    """
+    Generate a short content hash for cache keys and IDs.
+
+    BLAKE2b with an 8-byte digest gives the same 16 hex chars as the old
+    truncated SHA-256 but skips computing the 24 bytes that were thrown
+    away; nothing keyed by this hash needs cryptographic strength.
+    """
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
 
 
 def clean_text(text: str) -> str:
     """Clean and normalize text content."""
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    # Remove control characters
-    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text)
-    return text.strip()
+    # Strip control characters, then collapse whitespace (the only step
+    # that genuinely needs a regex)
+    return _WS_RE.sub(' ', text.translate(_CTRL_TABLE)).strip()
 
 
 def extract_email(text: str) -> Optional[str]:
     """Extract email from text."""
-    pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    match = re.search(pattern, text)
+    match = _EMAIL_RE.search(text)
     return match.group() if match else None
 
 
 def extract_phone(text: str) -> Optional[str]:
     """Extract phone number from text."""
-    pattern = r'[\+]?[(]?[0-9]{1,3}[)]?[-\s\.]?[0-9]{3}[-\s\.]?[0-9]{4,6}'
-    match = re.search(pattern, text)
+    match = _PHONE_RE.search(text)
     return match.group() if match else None
 
 
 def extract_years_of_experience(text: str) -> Optional[int]:
     """Extract years of experience from text."""
-    patterns = [
-        r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:experience|exp)',
-        r'experience\s*[:of]?\s*(\d+)\+?\s*years?',
-        r'(\d+)\+?\s*yrs?\s*(?:of\s*)?(?:experience|exp)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text.lower())
-        if match:
-            return int(match.group(1))
-    
+    match = _YOE_RE.search(text)
+    if match:
+        return int(match.group(1) or match.group(2))
+
     return None
 
 
+# Resume section headings recognized by extract_section_snippet; each
+# section maps to its heading variants, compiled once into per-section
+# patterns plus one any-heading boundary pattern
+_SECTION_HEADINGS: Dict[str, tuple] = {
+    "experience": ("experience", "work history", "employment"),
+    "education": ("education", "academic background"),
+    "skills": ("skills", "technical skills", "competencies"),
+}
+
+_SECTION_PATTERNS: Dict[str, re.Pattern] = {
+    section: re.compile(
+        r'(?im)^[ \t]*(?:' + '|'.join(re.escape(h) for h in headings) + r')\b[^\n]*$'
+    )
+    for section, headings in _SECTION_HEADINGS.items()
+}
+
+_ANY_SECTION_RE = re.compile(
+    r'(?im)^[ \t]*(?:' + '|'.join(
+        re.escape(h) for headings in _SECTION_HEADINGS.values() for h in headings
+    ) + r')\b[^\n]*$'
+)
+
+
+def extract_section_snippet(text: str, section: str, max_chars: int = 2500) -> str:
+    """
+    Return the snippet under a named resume section heading.
+
+    The snippet runs from the section heading to the next recognized
+    heading (or max_chars, whichever comes first). Returns "" when the
+    section heading isn't found.
+    """
+    pattern = _SECTION_PATTERNS.get(section)
+    if pattern is None:
+        return ""
+
+    match = pattern.search(text)
+    if not match:
+        return ""
+
+    next_heading = _ANY_SECTION_RE.search(text, match.end())
+    end = next_heading.start() if next_heading else len(text)
+    return text[match.start():min(end, match.start() + max_chars)].strip()
+
+
 def parse_date_range(text: str) -> Dict[str, Any]:
     """Parse a date range from text."""
     # Common patterns: "Jan 2020 - Present", "2019-2022", etc.
@@ -72,11 +139,12 @@ def parse_date_range(text: str) -> Dict[str, Any]:
         "is_current": False
     }
     
-    if "present" in text.lower() or "current" in text.lower():
+    text_lower = text.lower()
+    if "present" in text_lower or "current" in text_lower:
         result["is_current"] = True
     
     # Extract years
-    years = re.findall(r'\b(19|20)\d{2}\b', text)
+    years = _YEAR_RE.findall(text)
     if years:
         result["start_date"] = int(years[0])
         if len(years) > 1:
@@ -102,31 +170,32 @@ def truncate_text(text: str, max_length: int = 500, suffix: str = "...") -> str:
 
 
 def sanitize_for_json(obj: Any) -> Any:
-    """Sanitize an object for JSON serialization."""
-    if isinstance(obj, dict):
-        return {k: sanitize_for_json(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [sanitize_for_json(item) for item in obj]
-    elif isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, (int, float, str, bool, type(None))):
-        return obj
-    else:
-        return str(obj)
+    """
+    Sanitize an object for JSON serialization.
+
+    One orjson round-trip replaces the recursive Python walker: the whole
+    structure is traversed in C, datetimes become ISO strings natively,
+    and anything orjson can't encode falls back to str().
+    """
+    return orjson.loads(
+        orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    )
 
 
 def merge_skill_lists(*skill_lists: List[str]) -> List[str]:
     """Merge multiple skill lists, removing duplicates."""
     seen = set()
     result = []
-    
+
     for skills in skill_lists:
         for skill in skills:
-            skill_lower = skill.lower().strip()
-            if skill_lower not in seen:
-                seen.add(skill_lower)
-                result.append(skill.strip())
-    
+            stripped = skill.strip()
+            # casefold also dedupes unicode variants lower() misses
+            key = stripped.casefold()
+            if key not in seen:
+                seen.add(key)
+                result.append(stripped)
+
     return result
 
 
@@ -135,46 +204,75 @@ def batch_items(items: List[Any], batch_size: int) -> List[List[Any]]:
     return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
 
 
+class LRUCache(OrderedDict):
+    """
+    Bounded mapping that evicts the least-recently-used entry.
+
+    Reads and writes both move the entry to the hot end, so entries that
+    are still being served stay resident while stale ones age out. The
+    evictions counter makes cache pressure visible without logging on
+    every overflow.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        super().__init__()
+        self.maxsize = maxsize
+        self.evictions = 0
+
+    def __getitem__(self, key: Any) -> Any:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key in self:
+            self.move_to_end(key)
+        super().__setitem__(key, value)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
 class RateLimiter:
-    """Simple in-memory rate limiter."""
-    
+    """
+    Simple in-memory rate limiter.
+
+    Timestamps per key live in a deque in arrival order, so expiring old
+    entries is an O(1) pop from the left per expired entry instead of
+    rebuilding the whole list on every request. time.monotonic is both
+    cheaper than datetime arithmetic and immune to wall-clock jumps.
+    """
+
     def __init__(self, max_requests: int = 100, window_seconds: int = 60):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Dict[str, List[datetime]] = {}
-    
+        self.requests: Dict[str, deque] = defaultdict(deque)
+
+    def _evict_expired(self, key: str) -> deque:
+        dq = self.requests[key]
+        cutoff = time.monotonic() - self.window_seconds
+        while dq and dq[0] < cutoff:
+            dq.popleft()
+        return dq
+
     def is_allowed(self, key: str) -> bool:
         """Check if a request is allowed."""
-        now = datetime.now()
-        
-        if key not in self.requests:
-            self.requests[key] = []
-        
-        # Remove old requests
-        self.requests[key] = [
-            t for t in self.requests[key]
-            if (now - t).total_seconds() < self.window_seconds
-        ]
-        
+        dq = self._evict_expired(key)
+
         # Check limit
-        if len(self.requests[key]) >= self.max_requests:
+        if len(dq) >= self.max_requests:
             return False
-        
+
         # Add new request
-        self.requests[key].append(now)
+        dq.append(time.monotonic())
         return True
-    
+
     def get_remaining(self, key: str) -> int:
         """Get remaining requests for a key."""
-        now = datetime.now()
-        
-        if key not in self.requests:
-            return self.max_requests
-        
-        # Remove old requests
-        self.requests[key] = [
-            t for t in self.requests[key]
-            if (now - t).total_seconds() < self.window_seconds
-        ]
-        
-        return max(0, self.max_requests - len(self.requests[key]))
\ No newline at end of file
+        return max(0, self.max_requests - len(self._evict_expired(key)))
\ No newline at end of file